@@ -1,5 +1,7 @@
 recipes_list = []
-ingredients_list = []
+# Every distinct ingredient maps to an id given in first-seen order, so checking for a repeat is a hash
+# lookup instead of a scan of all the ingredients so far
+ingredient_ids = {}
 
 def take_recipe():
     name = input("enter recipe name: ")
@@ -25,9 +27,9 @@ print()
 
 for i in range(int(n)):
     recipe = take_recipe()
+    # New ingredients get the next id; ones already seen keep theirs
     for item in recipe["ingredients"]:
-        if not(item in ingredients_list):
-            ingredients_list.append(item)
+        ingredient_ids.setdefault(item, len(ingredient_ids))
     recipes_list.append(recipe)
 
 print()
@@ -49,7 +51,6 @@ for item in recipes_list:
     print("Difficulty Level: " + difficulty)
     print()
 
-ingredients_list.sort()
 print("Ingredients Available Across All Recipes")
-for item in ingredients_list:
+for item in sorted(ingredient_ids):
     print(item)
\ No newline at end of file
@@ -0,0 +1,69 @@
+def normalize_ingredient(name):
+    # Ingredients are matched case-insensitively and with runs of whitespace collapsed to one space
+    return " ".join(name.split()).lower()
+
+
+# Interns ingredient names: every distinct (normalized) name gets a stable integer id.
+#
+# Ids are handed out in first-seen order and looked up through a dict, so registering n ingredients
+# takes O(n) time instead of the O(n^2) of checking a list before appending to it. With a path the
+# names are appended to a text file, one per line, and the line number is the id, so the ids stay the
+# same the next time the file is opened.
+class IngredientRegistry:
+    def __init__(self, path=None, normalize=True):
+        self.path = path
+        self.normalize = normalize
+        self.names = []
+        self.ids = {}
+        self.file = None
+        if path is not None:
+            self.file = open(path, "a+", encoding="utf-8")
+            self.file.seek(0)
+            for line in self.file:
+                self.ids.setdefault(line.rstrip("\n"), len(self.names))
+                self.names.append(line.rstrip("\n"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def key(self, name):
+        return normalize_ingredient(name) if self.normalize else name
+
+    def intern(self, name):
+        # Returns the id of the ingredient, registering it first if it has not been seen before
+        key = self.key(name)
+        ingredient_id = self.ids.get(key)
+        if ingredient_id is None:
+            ingredient_id = self.ids[key] = len(self.names)
+            self.names.append(key)
+            if self.file is not None:
+                self.file.write(key + "\n")
+                self.file.flush()
+        return ingredient_id
+
+    def intern_all(self, names):
+        # Ids of the given ingredients in order, with repeated ingredients dropped
+        return list(dict.fromkeys(self.intern(name) for name in names))
+
+    def id(self, name):
+        # Id of an already registered ingredient, or None
+        return self.ids.get(self.key(name))
+
+    def name(self, ingredient_id):
+        return self.names[ingredient_id]
+
+    def __contains__(self, name):
+        return self.key(name) in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
@@ -0,0 +1,232 @@
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from ingredient_registry import normalize_ingredient
+from recipe_store import RecipeStore
+
+# Every column is an array of 4-byte unsigned integers, written little-endian
+COLUMN_TYPE = "I"
+MAGIC = b"RCOL"
+VERSION = 1
+# Header: magic, version, number of recipes, number of distinct ingredients, number of strings,
+# number of (recipe, ingredient) pairs and the size of the string data in bytes
+HEADER = struct.Struct("<4sIIIIII")
+
+
+# Columnar recipe file that is read through mmap without unpickling anything.
+#
+# The file holds a header followed by these columns, in this order:
+#   string_offsets   - start of every string in the string data, plus the end of the last one
+#   string_data      - all strings as UTF-8, padded to 4 bytes; the ingredients come first, sorted
+#   names            - string id of every recipe name
+#   difficulties     - string id of every difficulty
+#   cooking_times    - cooking time of every recipe
+#   ingredient_starts, ingredient_ids - the ingredient ids of recipe n are
+#                      ingredient_ids[ingredient_starts[n]:ingredient_starts[n + 1]]
+#   recipe_starts, recipe_ids - the recipes using ingredient i are
+#                      recipe_ids[recipe_starts[i]:recipe_starts[i + 1]]
+#   time_order, sorted_times - the recipe numbers sorted by cooking time, and their cooking times
+#
+# Searches run on memoryviews of the mapped file, so every process reading the file shares the same
+# page-cache copy. The recipe numbers found are copied out into one array per query, so the results
+# stay usable after the file is closed.
+class RecipeColumns:
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Recipe column files can only be read on little-endian machines")
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, version, recipe_count, ingredient_count, string_count, pair_count, string_size = \
+            HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a recipe column file")
+        self.recipe_count = recipe_count
+        self.ingredient_count = ingredient_count
+
+        self.position = HEADER.size
+        self.string_offsets = self.column(string_count + 1)
+        self.string_data = self.view[self.position:self.position + string_size]
+        self.position += padded(string_size)
+        self.names = self.column(recipe_count)
+        self.difficulties = self.column(recipe_count)
+        self.cooking_times = self.column(recipe_count)
+        self.ingredient_starts = self.column(recipe_count + 1)
+        self.ingredient_ids = self.column(pair_count)
+        self.recipe_starts = self.column(ingredient_count + 1)
+        self.recipe_ids = self.column(pair_count)
+        self.time_order = self.column(recipe_count)
+        self.sorted_times = self.column(recipe_count)
+
+    def column(self, length):
+        size = length * array(COLUMN_TYPE).itemsize
+        column = self.view[self.position:self.position + size].cast(COLUMN_TYPE)
+        self.position += size
+        return column
+
+    @staticmethod
+    def is_column_file(path):
+        try:
+            with open(path, "rb") as file:
+                return file.read(len(MAGIC)) == MAGIC
+        except OSError:
+            return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # The column views have to be released before the mapping can be closed
+        for name, value in list(vars(self).items()):
+            if isinstance(value, memoryview):
+                value.release()
+        self.map.close()
+
+    def __len__(self):
+        return self.recipe_count
+
+    def string_bytes(self, string_id):
+        return self.string_data[self.string_offsets[string_id]:self.string_offsets[string_id + 1]]
+
+    def string(self, string_id):
+        return str(self.string_bytes(string_id), "utf-8")
+
+    def ingredients(self):
+        return [self.string(i) for i in range(self.ingredient_count)]
+
+    def ingredient_id(self, name):
+        # Binary search over the sorted ingredient strings; only the log2(n) probed strings are copied.
+        # The ingredients are stored normalized, so the name is normalized the same way first
+        wanted = normalize_ingredient(name).encode("utf-8")
+        low, high = 0, self.ingredient_count
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(self.string_bytes(middle)) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.ingredient_count and self.string_bytes(low) == wanted:
+            return low
+        return None
+
+    def recipes_with_ingredient(self, name):
+        ingredient_id = self.ingredient_id(name)
+        if ingredient_id is None:
+            return array(COLUMN_TYPE)
+        return copied(self.recipe_ids[self.recipe_starts[ingredient_id]:self.recipe_starts[ingredient_id + 1]])
+
+    def recipes_with_cooking_time(self, low, high):
+        # Recipe numbers with low <= cooking time <= high, in cooking time order
+        start = bisect_left(self.sorted_times, low)
+        end = bisect_right(self.sorted_times, high, start)
+        return copied(self.time_order[start:end])
+
+    def recipe_ingredient_ids(self, recipe_number):
+        start, end = self.ingredient_starts[recipe_number], self.ingredient_starts[recipe_number + 1]
+        return copied(self.ingredient_ids[start:end])
+
+    def recipe(self, recipe_number):
+        # Builds the same dict as recipe_input.py, for display only
+        return {"name": self.string(self.names[recipe_number]),
+                "cooking_time": str(self.cooking_times[recipe_number]),
+                "ingredients": [self.string(i) for i in self.recipe_ingredient_ids(recipe_number)],
+                "difficulty": self.string(self.difficulties[recipe_number])}
+
+
+def copied(view):
+    # Copies a column slice into an array in one go, releasing the slice so the mapping can be closed
+    result = array(COLUMN_TYPE)
+    with view, view.cast("B") as raw:
+        result.frombytes(raw)
+    return result
+
+
+def padded(size):
+    return size + -size % 4
+
+
+def write_columns(path, recipes):
+    # Writes the recipe dicts (from recipe_input.py) to a column file. Ingredients are normalized like in the
+    # IngredientRegistry, since the old pickle format stored them as they were typed
+    recipes = [dict(recipe, ingredients=[normalize_ingredient(item) for item in recipe["ingredients"]])
+               for recipe in recipes]
+    ingredient_names = sorted({item for recipe in recipes for item in recipe["ingredients"]},
+                              key=lambda item: item.encode("utf-8"))
+    strings = {name: i for i, name in enumerate(ingredient_names)}
+    for recipe in recipes:
+        for text in (recipe["name"], recipe["difficulty"]):
+            strings.setdefault(text, len(strings))
+
+    string_offsets = array(COLUMN_TYPE, [0])
+    string_data = bytearray()
+    for text in strings:
+        string_data += text.encode("utf-8")
+        string_offsets.append(len(string_data))
+
+    names = array(COLUMN_TYPE, (strings[recipe["name"]] for recipe in recipes))
+    difficulties = array(COLUMN_TYPE, (strings[recipe["difficulty"]] for recipe in recipes))
+    cooking_times = array(COLUMN_TYPE, (int(recipe["cooking_time"]) for recipe in recipes))
+
+    ingredient_starts = array(COLUMN_TYPE, [0])
+    ingredient_ids = array(COLUMN_TYPE)
+    recipes_by_ingredient = [[] for _ in ingredient_names]
+    for recipe_number, recipe in enumerate(recipes):
+        for ingredient_id in dict.fromkeys(strings[item] for item in recipe["ingredients"]):
+            ingredient_ids.append(ingredient_id)
+            recipes_by_ingredient[ingredient_id].append(recipe_number)
+        ingredient_starts.append(len(ingredient_ids))
+
+    recipe_starts = array(COLUMN_TYPE, [0])
+    recipe_ids = array(COLUMN_TYPE)
+    for recipe_numbers in recipes_by_ingredient:
+        recipe_ids.extend(recipe_numbers)
+        recipe_starts.append(len(recipe_ids))
+
+    time_order = array(COLUMN_TYPE, sorted(range(len(recipes)), key=cooking_times.__getitem__))
+    sorted_times = array(COLUMN_TYPE, (cooking_times[i] for i in time_order))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(recipes), len(ingredient_names), len(strings),
+                               len(ingredient_ids), len(string_data)))
+        write_column(file, string_offsets)
+        file.write(string_data + bytes(-len(string_data) % 4))
+        for column in (names, difficulties, cooking_times, ingredient_starts, ingredient_ids,
+                       recipe_starts, recipe_ids, time_order, sorted_times):
+            write_column(file, column)
+    return len(recipes)
+
+
+def write_column(file, column):
+    if sys.byteorder != "little":
+        column = array(COLUMN_TYPE, column)
+        column.byteswap()
+    file.write(column.tobytes())
+
+
+def read_recipes(path):
+    # Reads the recipes of a RecipeStore or of a file in the old whole-file pickle format
+    if RecipeStore.exists(path):
+        with RecipeStore(path) as store:
+            return list(store)
+    with open(path, "rb") as file:
+        return pickle.load(file)["recipes_list"]
+
+
+if __name__ == "__main__":
+    source = input("Enter the filename containing the recipe data: ")
+    target = input("Enter a filename for the column file: ")
+    try:
+        count = write_columns(target, read_recipes(source))
+    except FileNotFoundError:
+        print("File not found")
+    else:
+        print(f"Wrote {count} recipes to {target}")
@@ -1,4 +1,6 @@
-import pickle
+import os
+
+from recipe_store import RecipeStore
 
 def take_recipe():
     name = input("enter recipe name: ")
@@ -31,38 +33,18 @@ def calc_difficulty(recipe):
 
 filename = input("Enter a filename: ")
 
-recipes_list = []
-all_ingredients = []
-
-n = input("How many recipes would you like to enter? ")
-
-for i in range(int(n)):
-    recipe = take_recipe()
-    recipes_list.append(recipe)
-    for item in recipe["ingredients"]:
-        if not(item in all_ingredients):
-            all_ingredients.append(item)
+try:
+    with RecipeStore(filename) as store:
+        # A file written by the old whole-file pickle format is copied into the store once
+        if os.path.isfile(filename) and len(store) == 0:
+            store.import_pickle(filename)
 
-export_data = {"recipes_list" : recipes_list, "all_ingredients" : all_ingredients}
+        n = input("How many recipes would you like to enter? ")
 
-try:
-    with open(filename, 'wb') as file:
-        pickle.dump(export_data, file)
+        # Every recipe is appended as soon as it is entered, the earlier recipes are never rewritten
+        for i in range(int(n)):
+            store.add(take_recipe())
 except FileNotFoundError:
     print("File not found")
 except:
     print("Failed writing file")
-else:
-    file.close()
-
-try:
-    with open(filename, "rb") as file:
-        data = pickle.load(file)
-        recipes_list = data['recipes_list']
-        all_ingredients = data['all_ingredients']
-except FileNotFoundError:
-    print("File not found")
-except:
-    print("Failed reading file")
-else:
-    file.close()
\ No newline at end of file
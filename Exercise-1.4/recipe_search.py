@@ -1,5 +1,8 @@
 import pickle
 
+from recipe_columns import RecipeColumns
+from recipe_store import RecipeStore
+
 def display_recipe(recipe):
     print(recipe["name"])
     print(recipe["cooking_time"])
@@ -18,13 +21,34 @@ def search_ingredient(data):
                 print(item)
         file.close()
 
+def search_store(store):
+    print(store.ingredients())
+    ingredient_searched = input("Enter your chosen ingredient: ")
+    # Only the recipes listed for the ingredient in the posting file are read from disk
+    for item in store.find_by_ingredient(ingredient_searched):
+        print(item)
+
+def search_columns(columns):
+    print(columns.ingredients())
+    ingredient_searched = input("Enter your chosen ingredient: ")
+    # The matching recipe numbers come straight from the mapped file, only the printed recipes are decoded
+    for recipe_number in columns.recipes_with_ingredient(ingredient_searched):
+        print(columns.recipe(recipe_number))
+
 recipe_data = input("Enter the filename containing the recipe data: ")
 
-try:
-    with open(recipe_data, "rb") as file:
-        data = pickle.load(file)
-except:
-    print("File not found")
+if RecipeColumns.is_column_file(recipe_data):
+    with RecipeColumns(recipe_data) as columns:
+        search_columns(columns)
+elif RecipeStore.exists(recipe_data):
+    with RecipeStore(recipe_data) as store:
+        search_store(store)
 else:
-    search_ingredient(data)
-    file.close()
\ No newline at end of file
+    try:
+        with open(recipe_data, "rb") as file:
+            data = pickle.load(file)
+    except:
+        print("File not found")
+    else:
+        search_ingredient(data)
+        file.close()
@@ -0,0 +1,207 @@
+import os
+import pickle
+import struct
+
+from ingredient_registry import IngredientRegistry
+
+# Each record in the log is a 4-byte length followed by the pickled recipe dict, with ingredient ids
+# in place of the ingredient names
+RECORD_HEADER = struct.Struct("<I")
+# The offset index holds one 8-byte log offset per record, so record n starts at index position 8 * n
+OFFSET_ENTRY = struct.Struct("<Q")
+# The posting list holds one (record number, previous posting) pair per ingredient of each record, where the
+# previous posting is the number of the entry before it for the same ingredient, so the postings of one
+# ingredient form a chain that is walked back from its last entry
+POSTING_ENTRY = struct.Struct("<II")
+# The tail table holds the number of the last posting of every ingredient, so ingredient id n is at 4 * n
+TAIL_ENTRY = struct.Struct("<I")
+# Posting number standing for the end of a chain, or for an ingredient without postings
+NO_POSTING = 0xFFFFFFFF
+
+
+# Append-only recipe file with an offset index and an ingredient posting list.
+#
+# A store named "recipes" is made of five files:
+#   recipes.log  - the recipe records, appended one after another
+#   recipes.idx  - the log offset of every record
+#   recipes.ing  - the IngredientRegistry: normalized ingredient names, one per line
+#   recipes.post - (record number, previous posting) pairs, chained per ingredient
+#   recipes.tail - the last posting of every ingredient
+#
+# Adding a recipe appends to each file and updates one tail per ingredient, so it costs the
+# same however large the store is. Opening the store only reads the ingredient names, and an
+# ingredient search starts at the ingredient's tail and follows its chain, reading only its own
+# postings and then only the matching records. The offset index is written last, so a record
+# that was cut off by a crash is simply not part of the store.
+class RecipeStore:
+    def __init__(self, path):
+        self.path = path
+        self.log = open(path + ".log", "a+b")
+        self.idx = open(path + ".idx", "a+b")
+        self.post = open(path + ".post", "a+b")
+        self.registry = IngredientRegistry(path + ".ing")
+
+        tail_path = path + ".tail"
+        if os.path.exists(tail_path):
+            self.tail = open(tail_path, "r+b")
+            self.drop_unindexed_postings()
+        else:
+            self.tail = open(tail_path, "w+b")
+            self.rebuild_postings()
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(path + ".idx")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for file in (self.log, self.idx, self.post, self.tail):
+            file.close()
+        self.registry.close()
+
+    def __len__(self):
+        self.idx.seek(0, os.SEEK_END)
+        return self.idx.tell() // OFFSET_ENTRY.size
+
+    def drop_unindexed_postings(self):
+        # Postings of a record whose offset was never written (after a crash) would otherwise
+        # be attached to the next record added, so they are cut off from the end of the file,
+        # and every tail that points into the cut-off part is moved back along its chain
+        count = len(self)
+        self.post.seek(0, os.SEEK_END)
+        size = self.post.tell() // POSTING_ENTRY.size
+        kept = size
+        while kept > 0 and self.read_posting(kept - 1)[0] >= count:
+            kept -= 1
+        if kept < size:
+            tails = self.read_tails()
+            for ingredient_id, posting in enumerate(tails):
+                while posting != NO_POSTING and posting >= kept:
+                    posting = self.read_posting(posting)[1]
+                tails[ingredient_id] = posting
+            self.write_tails(tails)
+        self.post.truncate(kept * POSTING_ENTRY.size)
+
+    def rebuild_postings(self):
+        # Builds the posting chains and tails from the records, for a store written before they existed
+        self.post.truncate(0)
+        tails = [NO_POSTING] * len(self.registry)
+        postings = []
+        for record_number in range(len(self)):
+            for ingredient_id in self.read_record(record_number)["ingredients"]:
+                postings.append(POSTING_ENTRY.pack(record_number, tails[ingredient_id]))
+                tails[ingredient_id] = len(postings) - 1
+        self.post.write(b"".join(postings))
+        self.post.flush()
+        self.write_tails(tails)
+
+    def read_posting(self, posting):
+        self.post.seek(posting * POSTING_ENTRY.size)
+        return POSTING_ENTRY.unpack(self.post.read(POSTING_ENTRY.size))
+
+    def tail_count(self):
+        self.tail.seek(0, os.SEEK_END)
+        return self.tail.tell() // TAIL_ENTRY.size
+
+    def read_tails(self):
+        # Tails of all registered ingredients, with NO_POSTING for ingredients the table does not reach yet
+        self.tail.seek(0)
+        data = self.tail.read(len(self.registry) * TAIL_ENTRY.size)
+        tails = [posting for (posting,) in TAIL_ENTRY.iter_unpack(data[:len(data) - len(data) % TAIL_ENTRY.size])]
+        return tails + [NO_POSTING] * (len(self.registry) - len(tails))
+
+    def write_tails(self, tails):
+        self.tail.seek(0)
+        self.tail.truncate(0)
+        self.tail.write(b"".join(TAIL_ENTRY.pack(posting) for posting in tails))
+        self.tail.flush()
+
+    def read_tail(self, ingredient_id):
+        self.tail.seek(ingredient_id * TAIL_ENTRY.size)
+        data = self.tail.read(TAIL_ENTRY.size)
+        return TAIL_ENTRY.unpack(data)[0] if len(data) == TAIL_ENTRY.size else NO_POSTING
+
+    def write_tail(self, ingredient_id, posting):
+        # The table is padded up to the ingredient first, since ids are handed out in order
+        missing = ingredient_id - self.tail_count()
+        if missing > 0:
+            self.tail.seek(0, os.SEEK_END)
+            self.tail.write(TAIL_ENTRY.pack(NO_POSTING) * missing)
+        self.tail.seek(ingredient_id * TAIL_ENTRY.size)
+        self.tail.write(TAIL_ENTRY.pack(posting))
+
+    def ingredients(self):
+        return list(self.registry)
+
+    def add(self, recipe):
+        # Appends one recipe and returns its record number
+        record_number = len(self)
+        ingredient_ids = self.registry.intern_all(recipe["ingredients"])
+        data = pickle.dumps(dict(recipe, ingredients=ingredient_ids))
+
+        self.log.seek(0, os.SEEK_END)
+        offset = self.log.tell()
+        self.log.write(RECORD_HEADER.pack(len(data)) + data)
+        self.log.flush()
+
+        self.post.seek(0, os.SEEK_END)
+        first_posting = self.post.tell() // POSTING_ENTRY.size
+        self.post.write(b"".join(POSTING_ENTRY.pack(record_number, self.read_tail(i)) for i in ingredient_ids))
+        self.post.flush()
+        for posting, ingredient_id in enumerate(ingredient_ids, first_posting):
+            self.write_tail(ingredient_id, posting)
+        self.tail.flush()
+
+        self.idx.write(OFFSET_ENTRY.pack(offset))
+        self.idx.flush()
+        return record_number
+
+    def read_record(self, record_number):
+        # The stored recipe dict, with ingredient ids
+        self.idx.seek(record_number * OFFSET_ENTRY.size)
+        (offset,) = OFFSET_ENTRY.unpack(self.idx.read(OFFSET_ENTRY.size))
+
+        self.log.seek(offset)
+        (length,) = RECORD_HEADER.unpack(self.log.read(RECORD_HEADER.size))
+        return pickle.loads(self.log.read(length))
+
+    def get(self, record_number):
+        if not 0 <= record_number < len(self):
+            raise IndexError("record number out of range")
+        recipe = self.read_record(record_number)
+        recipe["ingredients"] = [self.registry.name(i) for i in recipe["ingredients"]]
+        return recipe
+
+    def __iter__(self):
+        for record_number in range(len(self)):
+            yield self.get(record_number)
+
+    def record_numbers(self, ingredient):
+        # Record numbers of all recipes containing the ingredient, read from the ingredient's own postings only
+        ingredient_id = self.registry.id(ingredient)
+        if ingredient_id is None:
+            return []
+
+        matches = []
+        posting = self.read_tail(ingredient_id)
+        while posting != NO_POSTING:
+            record_number, posting = self.read_posting(posting)
+            matches.append(record_number)
+        matches.reverse()
+        return matches
+
+    def find_by_ingredient(self, ingredient):
+        return [self.get(record_number) for record_number in self.record_numbers(ingredient)]
+
+    def import_pickle(self, filename):
+        # Appends all recipes of a file written by the old whole-file pickle format
+        with open(filename, "rb") as file:
+            data = pickle.load(file)
+        for recipe in data["recipes_list"]:
+            self.add(recipe)
+        return len(data["recipes_list"])
@@ -0,0 +1,27 @@
+from recipe_columns import RecipeColumns, write_columns
+
+RECIPES = [
+    {"name": "Tea", "cooking_time": "5", "ingredients": ["Tea Leaves", "Water"], "difficulty": "Easy"},
+    {"name": "Pasta", "cooking_time": "15", "ingredients": ["pasta", "water", "salt"], "difficulty": "Medium"},
+    {"name": "Stew", "cooking_time": "90", "ingredients": ["beef", "carrot", "onion", "water", "salt"],
+     "difficulty": "Hard"},
+]
+
+
+def test_results_outlive_the_column_file(tmp_path):
+    path = tmp_path / "recipes.col"
+    write_columns(path, RECIPES)
+
+    # Results Kept: Closing must not fail while the caller still holds query results, and they stay readable
+    with RecipeColumns(path) as columns:
+        with_water = columns.recipes_with_ingredient("WATER")
+        quick = columns.recipes_with_cooking_time(1, 20)
+        missing = columns.recipes_with_ingredient("saffron")
+        stew_ingredients = columns.recipe_ingredient_ids(2)
+        stew = columns.recipe(2)
+
+    assert sorted(with_water) == [0, 1, 2]
+    assert list(quick) == [0, 1]
+    assert list(missing) == []
+    assert len(stew_ingredients) == 5
+    assert stew["ingredients"] == ["beef", "carrot", "onion", "water", "salt"]
@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+
 class Recipe:
     all_ingredients = set()
 
@@ -20,6 +24,7 @@ class Recipe:
     def add_ingredients(self, *args):
         for item in args:
             self.ingredients.append(item)
+        self.difficulty = None # recalculated on the next get_difficulty()
         self.update_all_ingredients()
 
     def get_ingredients(self):
@@ -38,24 +43,163 @@ class Recipe:
             Recipe.all_ingredients.add(ingredient)
 
     def __str__(self): # String representation of the recipe
-        self.calculate_difficulty()
-        return f"Recipe Name: {self.name}\nIngredients: {', '.join(self.ingredients)}\nCooking Time: {self.cooking_time} minutes\nDifficulty: {self.difficulty}"
+        return f"Recipe Name: {self.name}\nIngredients: {', '.join(self.ingredients)}\nCooking Time: {self.cooking_time} minutes\nDifficulty: {self.get_difficulty()}"
     
 
+class RecipeRecord:
+    # Compact recipe: no per-instance __dict__, and the ingredients as an array of catalog ingredient ids
+    __slots__ = ("name", "ingredient_ids", "cooking_time")
+
+    def __init__(self, name, ingredient_ids, cooking_time):
+        self.name = name
+        self.ingredient_ids = ingredient_ids
+        self.cooking_time = cooking_time
+
+    def __repr__(self):
+        return f"RecipeRecord({self.name!r}, {list(self.ingredient_ids)!r}, {self.cooking_time!r})"
+
+
+class RecipeCatalog:
+    # Stores recipes column-wise: one list of names, one array of cooking times, and the ingredient ids of
+    # all recipes in one flat array. The ingredients of recipe n are
+    # ingredient_ids[ingredient_starts[n]:ingredient_starts[n + 1]].
+    # Every ingredient name is stored once, in ingredient_names, instead of once per recipe.
+    # Two indexes are kept up to date by add() and remove(): recipe_index maps an ingredient id to the set of
+    # recipe ids using it, and time_index maps a cooking time to an array of the recipe ids with that time,
+    # with the distinct times kept sorted in cooking_time_values, so ingredient and cooking time queries never
+    # have to look at every recipe. Cooking times are small integers, so there are few distinct times and
+    # adding a recipe appends to one array instead of inserting into a list the size of the catalog.
+
+    def __init__(self, recipes=()):
+        self.names = []
+        self.cooking_times = array("I")
+        self.ingredient_starts = array("I", [0])
+        self.ingredient_ids = array("I")
+        self.ingredient_names = []
+        self.ingredient_index = {}
+        self.recipe_index = {}
+        self.time_index = {}
+        self.cooking_time_values = []
+        self.removed = set()
+        for recipe in recipes:
+            self.add_recipe(recipe)
+
+    def __len__(self):
+        return len(self.names) - len(self.removed)
+
+    def __contains__(self, recipe_id):
+        return 0 <= recipe_id < len(self.names) and recipe_id not in self.removed
+
+    def __iter__(self):
+        return (recipe_id for recipe_id in range(len(self.names)) if recipe_id not in self.removed)
+
+    def ingredient_id(self, ingredient):
+        if ingredient not in self.ingredient_index:
+            self.ingredient_index[ingredient] = len(self.ingredient_names)
+            self.ingredient_names.append(ingredient)
+        return self.ingredient_index[ingredient]
+
+    def add(self, name, ingredients, cooking_time):
+        # Adds one recipe and returns its recipe id
+        recipe_id = len(self.names)
+        self.names.append(name)
+        self.cooking_times.append(int(cooking_time))
+        self.ingredient_ids.extend(dict.fromkeys(self.ingredient_id(ingredient) for ingredient in ingredients))
+        self.ingredient_starts.append(len(self.ingredient_ids))
+
+        for ingredient_id in self.recipe_ingredient_ids(recipe_id):
+            self.recipe_index.setdefault(ingredient_id, set()).add(recipe_id)
+        cooking_time = self.cooking_times[recipe_id]
+        if cooking_time not in self.time_index:
+            self.time_index[cooking_time] = array("I")
+            insort(self.cooking_time_values, cooking_time)
+        self.time_index[cooking_time].append(recipe_id)
+        return recipe_id
+
+    def remove(self, recipe_id):
+        # Removes a recipe from the indexes. Its columns are left in place so the other recipe ids stay valid,
+        # and its id stays in its time_index array, where cooking time queries skip it as removed.
+        if recipe_id not in self:
+            raise KeyError(recipe_id)
+        for ingredient_id in self.recipe_ingredient_ids(recipe_id):
+            recipes = self.recipe_index[ingredient_id]
+            recipes.discard(recipe_id)
+            if not recipes:
+                del self.recipe_index[ingredient_id]
+        self.names[recipe_id] = None
+        self.removed.add(recipe_id)
+
+    def add_recipe(self, recipe):
+        return self.add(recipe.name, recipe.ingredients, recipe.cooking_time)
+
+    def recipe_ingredient_ids(self, recipe_id):
+        return self.ingredient_ids[self.ingredient_starts[recipe_id]:self.ingredient_starts[recipe_id + 1]]
+
+    def get_ingredients(self, recipe_id):
+        return [self.ingredient_names[i] for i in self.recipe_ingredient_ids(recipe_id)]
+
+    def record(self, recipe_id):
+        return RecipeRecord(self.names[recipe_id], self.recipe_ingredient_ids(recipe_id), self.cooking_times[recipe_id])
+
+    def recipe(self, recipe_id):
+        # Builds a full Recipe object, e.g. for printing
+        return Recipe(self.names[recipe_id], self.get_ingredients(recipe_id), self.cooking_times[recipe_id])
+
+    def all_ingredients(self):
+        return {self.ingredient_names[i] for i in self.recipe_index}
+
+    def recipes_with_cooking_time(self, min_time=None, max_time=None):
+        # Recipe ids with min_time <= cooking time <= max_time, in cooking time order
+        times = self.cooking_time_values
+        start = 0 if min_time is None else bisect_left(times, min_time)
+        end = len(times) if max_time is None else bisect_right(times, max_time)
+        return [recipe_id for cooking_time in times[start:end] for recipe_id in self.time_index[cooking_time]
+                if recipe_id not in self.removed]
+
+    def recipes_with_ingredients(self, ingredients, match_all=True):
+        # Recipe ids using all (or, with match_all=False, any) of the ingredients.
+        # Intersections start from the rarest ingredient, so they cost no more than its recipe count.
+        sets = [self.recipe_index.get(self.ingredient_index.get(ingredient), set()) for ingredient in ingredients]
+        if not sets:
+            return set()
+        if not match_all:
+            return set().union(*sets)
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def search(self, ingredients=(), match_all=True, min_time=None, max_time=None):
+        # Sorted recipe ids matching the ingredients and the cooking time range; both filters are optional
+        if not ingredients:
+            return sorted(self.recipes_with_cooking_time(min_time, max_time))
+        matches = self.recipes_with_ingredients(ingredients, match_all)
+        if min_time is None and max_time is None:
+            return sorted(matches)
+        low = float("-inf") if min_time is None else min_time
+        high = float("inf") if max_time is None else max_time
+        return sorted(recipe_id for recipe_id in matches if low <= self.cooking_times[recipe_id] <= high)
+
+
 def recipe_search(data, search_term):
     print(f"Recipes that contain '{search_term}':\n")
+    if isinstance(data, RecipeCatalog):
+        # The catalog answers from its ingredient index instead of checking every recipe
+        for recipe_id in data.search([search_term]):
+            print(data.recipe(recipe_id))
+        return
     for recipe in data:
         if recipe.search_ingredient(search_term):
             print(recipe)
 
 
-tea = Recipe("Tea", ["Tea Leaves", "Sugar", "Water"], 5)
-coffee = Recipe("Coffee", ["Coffee Powder", "Sugar", "Water"], 5)
-cake = Recipe("Cake", ["Sugar", "Butter", "Eggs", "Vanilla Essence", "Flour", "Baking Powder", "Milk"], 50)
-smoothie = Recipe("Banana Smoothie", ["Bananas", "Milk", "Peanut Butter", "Sugar", "Ice Cubes"], 5)
+if __name__ == "__main__":
+    tea = Recipe("Tea", ["Tea Leaves", "Sugar", "Water"], 5)
+    coffee = Recipe("Coffee", ["Coffee Powder", "Sugar", "Water"], 5)
+    cake = Recipe("Cake", ["Sugar", "Butter", "Eggs", "Vanilla Essence", "Flour", "Baking Powder", "Milk"], 50)
+    smoothie = Recipe("Banana Smoothie", ["Bananas", "Milk", "Peanut Butter", "Sugar", "Ice Cubes"], 5)
 
-recipes_list = [tea, coffee, cake, smoothie]
+    recipes_list = [tea, coffee, cake, smoothie]
+    catalog = RecipeCatalog(recipes_list)
 
-for ingredient in ["Water", "Sugar", "Bananas"]:
-    print()
-    recipe_search(recipes_list, ingredient)
\ No newline at end of file
+    for ingredient in ["Water", "Sugar", "Bananas"]:
+        print()
+        recipe_search(catalog, ingredient)
\ No newline at end of file
@@ -1,10 +1,26 @@
+import argparse
+import csv
+import time
+from collections import Counter, OrderedDict
+
 import mysql.connector
+from mysql.connector import pooling
 
-conn = mysql.connector.connect(
-    host = "localhost",
-    user = "cf-python",
-    passwd = "password"
-)
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "cf-python",
+    "passwd": "password"
+}
+
+# Connections kept open and reused by the menu actions
+POOL_SIZE = 5
+
+parser = argparse.ArgumentParser(description="Recipe app. Without arguments the interactive menu is started.")
+parser.add_argument("--import", dest="import_path", metavar="CSV",
+                    help="add the recipes of a CSV file (name, cooking_time, ingredients columns) and exit")
+args = parser.parse_args()
+
+conn = mysql.connector.connect(**DB_CONFIG)
 
 cursor = conn.cursor()
 
@@ -20,7 +36,102 @@ cursor.execute('''CREATE TABLE IF NOT EXISTS Recipes(
                difficulty VARCHAR(20)
 )''')
 
-def main_menu(conn, cursor):
+# Distinct ingredients with the number of recipes using each one, kept up to date on every change
+cursor.execute('''CREATE TABLE IF NOT EXISTS Ingredients(
+               name VARCHAR(255) PRIMARY KEY,
+               recipe_count INT NOT NULL DEFAULT 0
+)''')
+
+INGREDIENTS_PAGE_SIZE = 20
+
+# Search results are reused for SEARCH_CACHE_TTL seconds; above SEARCH_CACHE_SIZE searches the least recently used is dropped
+SEARCH_CACHE_SIZE = 128
+SEARCH_CACHE_TTL = 300
+
+
+class SearchCache:
+    # LRU cache of ingredient search results with an expiry time. The search matches ingredients with LIKE,
+    # so a change to an ingredient drops every cached search whose term is part of that ingredient's name.
+    def __init__(self, max_size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ingredient):
+        entry = self.entries.get(ingredient.lower())
+        if entry is None or entry[0] < time.monotonic():
+            self.entries.pop(ingredient.lower(), None)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(ingredient.lower())
+        self.hits += 1
+        return entry[1]
+
+    def put(self, ingredient, results):
+        self.entries[ingredient.lower()] = (time.monotonic() + self.ttl, results)
+        self.entries.move_to_end(ingredient.lower())
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, ingredients):
+        changed = [ingredient.lower() for ingredient in ingredients]
+        for key in [key for key in self.entries if any(key in ingredient for ingredient in changed)]:
+            del self.entries[key]
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+search_cache = SearchCache()
+
+def split_ingredients(ingredients_str):
+    return [ingredient.strip() for ingredient in ingredients_str.split(", ") if ingredient.strip()]
+
+
+def adjust_ingredient_counts(cursor, ingredient_counts):
+    # Add (or with negative counts, remove) recipes from the ingredient catalog with one executemany
+    rows = [(name, count, count) for name, count in ingredient_counts.items() if count]
+    if rows:
+        cursor.executemany(
+            "INSERT INTO Ingredients (name, recipe_count) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE recipe_count = recipe_count + %s",
+            rows
+        )
+
+
+def rebuild_ingredient_catalog(conn, cursor):
+    # One-time backfill for databases created before the Ingredients table existed
+    cursor.execute("SELECT COUNT(*) FROM Ingredients")
+    if cursor.fetchone()[0] > 0:
+        return
+
+    cursor.execute("SELECT ingredients FROM Recipes")
+    ingredient_counts = Counter()
+    for (ingredients_str,) in cursor.fetchall():
+        ingredient_counts.update(set(split_ingredients(ingredients_str or "")))
+    adjust_ingredient_counts(cursor, ingredient_counts)
+    conn.commit()
+
+
+def run_with_connection(pool, action):
+    # Each menu action borrows a connection from the pool and returns it when done,
+    # reconnecting first if the server dropped it while it sat idle
+    conn = pool.get_connection()
+    try:
+        conn.ping(reconnect=True, attempts=3, delay=1)
+        cursor = conn.cursor()
+        try:
+            action(conn, cursor)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+
+def main_menu(pool):
     choice = ""
     while(choice != "quit"):
         print()
@@ -34,6 +145,10 @@ def main_menu(conn, cursor):
         print("3. Update an existing recipe")
         print("4. Delete a recipe\n")
         print("Type 'quit' to exit the program\n")
+        # The search cache counters are shown once there has been a search
+        if search_cache.hits or search_cache.misses:
+            print(f"Search cache: {search_cache.hits} hits, {search_cache.misses} misses "
+                  f"(hit ratio {search_cache.hit_ratio():.0%})\n")
         choice = input("Your choice: ").strip().lower()
         print()
 
@@ -41,13 +156,13 @@ def main_menu(conn, cursor):
         if choice in ["1", "2", "3", "4"]:
 
             if choice == "1":
-                create_recipe(conn, cursor)
+                run_with_connection(pool, create_recipe)
             elif choice == "2":
-                search_recipe(conn, cursor)
+                run_with_connection(pool, search_recipe)
             elif choice == "3":
-                update_recipe(conn, cursor)
+                run_with_connection(pool, update_recipe)
             elif choice == "4":
-                delete_recipe(conn, cursor)
+                run_with_connection(pool, delete_recipe)
         elif choice == "quit":
             print("=============================================")
             print("      Thanks for using the Recipe App!       ")
@@ -60,8 +175,6 @@ def main_menu(conn, cursor):
             print("---------------------------------------------------\n")
             print("...returning to main menu\n\n")
 
-    conn.close()
-
 
 def create_recipe(conn, cursor):
     print()
@@ -93,11 +206,9 @@ def create_recipe(conn, cursor):
 
         ingredients_str = ", ".join(ingredients)
 
+        # Each recipe is committed as soon as it is entered, so the ones before a mistake are kept
         try:
-            insert_query = "INSERT INTO Recipes (name, ingredients, cooking_time, difficulty) VALUES (%s, %s, %s, %s)"
-            cursor.execute(insert_query, (name, ingredients_str, cooking_time, difficulty))
-            conn.commit()
-
+            insert_recipes(conn, cursor, [(name, ingredients_str, cooking_time, difficulty)])
             print("  ** Recipe successfully added! **")
         except mysql.connector.Error as err:
             print("Error occurred: ", err)
@@ -111,6 +222,62 @@ def create_recipe(conn, cursor):
     print("...returning to main menu\n\n")
 
 
+def insert_recipes(conn, cursor, recipes, batch_size=1000):
+    # Insert the recipes with one executemany and one commit per batch instead of one round trip per row
+    insert_query = "INSERT INTO Recipes (name, ingredients, cooking_time, difficulty) VALUES (%s, %s, %s, %s)"
+    try:
+        for start in range(0, len(recipes), batch_size):
+            batch = recipes[start:start + batch_size]
+            cursor.executemany(insert_query, batch)
+
+            ingredient_counts = Counter()
+            for recipe in batch:
+                ingredient_counts.update(set(split_ingredients(recipe[1])))
+            adjust_ingredient_counts(cursor, ingredient_counts)
+
+            conn.commit()
+            search_cache.invalidate(ingredient_counts)
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+
+
+def read_recipe_file(path):
+    # Rows of a CSV file with name, cooking_time and ingredients (comma separated) columns, as recipe tuples.
+    # Rows without a name, a positive cooking time or ingredients are skipped
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            name = (row.get("name") or "").strip()
+            ingredients = [item.strip() for item in (row.get("ingredients") or "").split(",") if item.strip()]
+            try:
+                cooking_time = int(row.get("cooking_time") or "")
+            except ValueError:
+                continue
+            if 0 < len(name) <= 50 and cooking_time > 0 and ingredients:
+                yield (name, ", ".join(ingredients), cooking_time, calculate_difficulty(cooking_time, ingredients))
+
+
+def import_recipes(pool, path, batch_size=1000):
+    # Non-interactive bulk import: reads the file one batch at a time and inserts each batch with insert_recipes()
+    imported = 0
+
+    def import_batches(conn, cursor):
+        nonlocal imported
+        batch = []
+        for recipe in read_recipe_file(path):
+            batch.append(recipe)
+            if len(batch) == batch_size:
+                insert_recipes(conn, cursor, batch, batch_size)
+                imported += len(batch)
+                batch = []
+        if batch:
+            insert_recipes(conn, cursor, batch, batch_size)
+            imported += len(batch)
+
+    run_with_connection(pool, import_batches)
+    return imported
+
+
 def calculate_difficulty(cooking_time, ingredients):
     num_ingredients = len(ingredients)
     if cooking_time < 10 and num_ingredients < 4:
@@ -133,10 +300,11 @@ def format_recipe_display(recipe):
 
 
 def search_recipe(conn, cursor):
-    cursor.execute("SELECT ingredients FROM Recipes")
-    results = cursor.fetchall()
+    page_query = "SELECT name, recipe_count FROM Ingredients WHERE recipe_count > 0 AND name > %s ORDER BY name LIMIT %s"
+    cursor.execute(page_query, ("", INGREDIENTS_PAGE_SIZE))
+    page = cursor.fetchall()
 
-    if not results:
+    if not page:
         print("***************************************************************")
         print("        There are no recipes in the database to search.        ")
         print("                  Please create a new recipe!                  ")
@@ -144,40 +312,54 @@ def search_recipe(conn, cursor):
         print("...returning to main menu\n\n")
         return
 
-    all_ingredients = set()
-
     print()
     print("=================================================================")
     print("           *** Search for a Recipe By Ingredient ***             ")
     print("=================================================================")
     print("Please enter a number to see all recipes that use that ingredient\n")
 
-    for result in results:
-        ingredients_list = result[0].split(", ")
-        for ingredient in ingredients_list:
-            all_ingredients.add(ingredient.strip())
-
-    for i, ingredient in enumerate(sorted(all_ingredients)):
-        print(f"{i+1}.) {ingredient.title()}")
-
-    print()
+    all_ingredients = []
     while True:
-        try:
-            choice = int(input("Enter a number for the ingredient: "))
-            if 1 <= choice <= len(all_ingredients):
+        for ingredient, recipe_count in page:
+            all_ingredients.append(ingredient)
+            print(f"{len(all_ingredients)}.) {ingredient.title()} ({recipe_count})")
+        more_ingredients = len(page) == INGREDIENTS_PAGE_SIZE
+
+        print()
+        while True:
+            prompt = "Enter a number for the ingredient"
+            if more_ingredients:
+                prompt += ", or press ENTER to see more ingredients"
+            answer = input(prompt + ": ").strip()
+            if answer == "" and more_ingredients:
                 break
-            else:
+            try:
+                choice = int(answer)
+                if 1 <= choice <= len(all_ingredients):
+                    break
+                else:
+                    print()
+                    print("Please enter a number within the list range.\n")
+            except ValueError:
                 print()
-                print("Please enter a number within the list range.\n")
-        except ValueError:
-            print()
-            print("Invalid input. Please enter a number.\n")
+                print("Invalid input. Please enter a number.\n")
 
-    selected_ingredient = sorted(all_ingredients)[choice - 1]
+        if answer != "":
+            break
+
+        cursor.execute(page_query, (all_ingredients[-1], INGREDIENTS_PAGE_SIZE))
+        page = cursor.fetchall()
+        if not page:
+            print("There are no more ingredients.\n")
 
-    search_query = "SELECT * FROM Recipes WHERE ingredients LIKE %s"
-    cursor.execute(search_query, ("%" + selected_ingredient + "%",))
-    search_results = cursor.fetchall()
+    selected_ingredient = all_ingredients[choice - 1]
+
+    search_results = search_cache.get(selected_ingredient)
+    if search_results is None:
+        search_query = "SELECT * FROM Recipes WHERE ingredients LIKE %s"
+        cursor.execute(search_query, ("%" + selected_ingredient + "%",))
+        search_results = cursor.fetchall()
+        search_cache.put(selected_ingredient, search_results)
 
     if search_results:
         recipe_count = len(search_results)
@@ -270,6 +452,11 @@ def update_recipe(conn, cursor):
     else:
         new_value = input(f"Enter the new value for {update_field}: ")
 
+    if update_field == "ingredients":
+        ingredient_counts = Counter(set(split_ingredients(new_value)))
+        ingredient_counts.subtract(set(split_ingredients(selected_recipe[2])))
+        adjust_ingredient_counts(cursor, ingredient_counts)
+
     update_query = f"UPDATE Recipes SET {update_field} = %s WHERE id = %s"
     cursor.execute(update_query, (new_value, recipe_id))
 
@@ -281,6 +468,11 @@ def update_recipe(conn, cursor):
         cursor.execute("UPDATE Recipes SET difficulty = %s WHERE id = %s", (new_difficulty, recipe_id))
 
     conn.commit()
+    # Cached results hold whole rows, so any change to the recipe drops the searches of its old and new ingredients
+    changed_ingredients = split_ingredients(selected_recipe[2])
+    if update_field == "ingredients":
+        changed_ingredients += split_ingredients(new_value)
+    search_cache.invalidate(changed_ingredients)
 
     print()
     print("--------------------------------------------------")
@@ -328,8 +520,8 @@ def delete_recipe(conn, cursor):
                 print("No recipe found with the entered ID. Please try again.\n")
             else:
                 
-                cursor.execute("SELECT name FROM Recipes WHERE id = %s", (recipe_id,))
-                recipe_name = cursor.fetchone()[0]
+                cursor.execute("SELECT name, ingredients FROM Recipes WHERE id = %s", (recipe_id,))
+                recipe_name, recipe_ingredients = cursor.fetchone()
                 confirm = input(f"Are you sure you want to delete '{recipe_name}'? (Yes/No): ").lower()
                 
                 if confirm == "yes":
@@ -347,8 +539,10 @@ def delete_recipe(conn, cursor):
             print("Invalid input. Please enter a numeric value.\n")
 
     cursor.execute("DELETE FROM Recipes WHERE id = %s", (recipe_id,))
+    adjust_ingredient_counts(cursor, Counter({ingredient: -1 for ingredient in set(split_ingredients(recipe_ingredients))}))
 
     conn.commit()
+    search_cache.invalidate(split_ingredients(recipe_ingredients))
 
     print()
     print("--------------------------------------------------")
@@ -357,4 +551,21 @@ def delete_recipe(conn, cursor):
     print("...returning to main menu\n\n")
     
 
-main_menu(conn, cursor)
\ No newline at end of file
+rebuild_ingredient_catalog(conn, cursor)
+cursor.close()
+conn.close()
+
+pool = pooling.MySQLConnectionPool(
+    pool_name="recipe_pool",
+    pool_size=POOL_SIZE,
+    database="task_database",
+    **DB_CONFIG
+)
+
+if args.import_path:
+    try:
+        print(f"Imported {import_recipes(pool, args.import_path)} recipes.")
+    except (OSError, mysql.connector.Error) as err:
+        print("Import failed: ", err)
+else:
+    main_menu(pool)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import recipe_app
+from recipe_app import RecipeService, init_db, configure_database, search_cache, set_sqlite_pragmas, PAGE_SIZE, MATCH_ANY, \
+    MEMORY_DATABASE_URL
+from recipe_metrics import query_metrics
+
+# Async Drivers: The asyncio driver used for each synchronous backend of recipe_app.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "asyncmy"}
+
+# Maximum Page Size: Upper limit for the "limit" query parameter.
+MAX_PAGE_SIZE = 100
+
+# Maximum Body Size: Larger request bodies are rejected.
+MAX_BODY_SIZE = 64 * 1024
+
+
+class HTTPError(Exception):
+    # HTTP Error: Raised by a route to answer with an error status and message.
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Status Texts: Reason phrases for the status codes the API returns.
+STATUS_TEXTS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def create_async_recipe_engine(url):
+    # Create Async Engine: Uses the asyncio driver of the same backend as the synchronous app engine.
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver is configured for '{backend}' databases.")
+    options = {}
+    in_memory = backend == "sqlite" and (url.database in (None, "", ":memory:") or url.query.get("mode") == "memory")
+    if in_memory:
+        # In-memory SQLite: Attach to the shared-cache database that the synchronous engine keeps open.
+        url = make_url(MEMORY_DATABASE_URL)
+        options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"), **options)
+
+    if backend == "sqlite":
+        # SQLite Pragmas: The same per-connection settings as the synchronous engine; without foreign keys
+        # the ON DELETE CASCADE rules would not remove the ingredient links of deleted recipes.
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            connection_record.info["in_memory"] = in_memory
+            set_sqlite_pragmas(dbapi_connection, connection_record)
+
+    return async_engine
+
+
+class RecipeAPI:
+    # Recipe API: Maps HTTP requests to RecipeService calls. The service runs in the async session's
+    # greenlet through run_sync(), so database I/O never blocks the event loop.
+
+    def __init__(self, url):
+        self.engine = create_async_recipe_engine(url)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def call(self, operation):
+        # Call: Runs operation(service) in its own session and commits when it succeeds.
+        async with self.sessions() as session:
+            result = await session.run_sync(lambda sync_session: operation(RecipeService(sync_session)))
+            await session.commit()
+            return result
+
+    async def handle(self, method, path, query, body):
+        # Handle: Routes one request and returns (status, payload).
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["recipes"]:
+            if method == "GET":
+                limit = min(int_param(query, "limit", PAGE_SIZE), MAX_PAGE_SIZE)
+                if "name" in query:
+                    name = query["name"][0]
+                    return 200, await self.call(lambda service: [
+                        recipe.to_dict() for recipe in service.search_by_name(name, limit)])
+                after_id = int_param(query, "after", 0)
+                difficulty = query.get("difficulty", [None])[0]
+                return 200, await self.call(lambda service: [
+                    recipe.to_dict() for recipe in service.list_recipes(after_id, limit, difficulty)])
+            if method == "POST":
+                data = json_body(body)
+                return 201, await self.call(lambda service: service.create_recipe(
+                    data.get("name", ""), data.get("cooking_time"), data.get("ingredients", "")).to_dict())
+            if method == "DELETE":
+                filters = batch_filters(query)
+                return 200, {"deleted": await self.call(lambda service: service.delete_recipes(**filters))}
+            if method == "PATCH":
+                filters = batch_filters(query)
+                data = json_body(body)
+                if "scale_cooking_time" not in data:
+                    raise HTTPError(400, "Add 'scale_cooking_time' to the request body.")
+                return 200, {"updated": await self.call(lambda service: service.scale_cooking_times(
+                    data["scale_cooking_time"], **filters))}
+            raise HTTPError(405, "Use GET, POST, PATCH or DELETE.")
+
+        if len(parts) == 2 and parts[0] == "recipes":
+            recipe_id = int_value(parts[1], "recipe ID")
+            if method == "GET":
+                recipe = await self.call(lambda service: optional_dict(service.get_recipe(recipe_id)))
+            elif method in ("PATCH", "PUT"):
+                data = json_body(body)
+                recipe = await self.call(lambda service: optional_dict(service.update_recipe(
+                    recipe_id, data.get("name"), data.get("cooking_time"), data.get("ingredients"))))
+            elif method == "DELETE":
+                if await self.call(lambda service: service.delete_recipe(recipe_id)):
+                    return 204, None
+                recipe = None
+            else:
+                raise HTTPError(405, "Use GET, PATCH or DELETE.")
+            if recipe is None:
+                raise HTTPError(404, f"No recipe found with ID {recipe_id}.")
+            return 200, recipe
+
+        if parts == ["ingredients"] and method == "GET":
+            after_name = query.get("after", [""])[0]
+            limit = min(int_param(query, "limit", PAGE_SIZE), MAX_PAGE_SIZE)
+            return 200, await self.call(lambda service: [
+                {"name": ingredient.name, "recipe_count": ingredient.recipe_count}
+                for ingredient in service.list_ingredients(after_name, limit)])
+
+        if parts == ["search"] and method == "GET":
+            ingredients = query.get("ingredient", [])
+            if not ingredients:
+                raise HTTPError(400, "Add at least one 'ingredient' query parameter.")
+            mode = query.get("mode", [MATCH_ANY])[0]
+            min_matches = int_param(query, "min", None)
+            limit = min(int_param(query, "limit", PAGE_SIZE), MAX_PAGE_SIZE)
+            offset = int_param(query, "offset", 0)
+            return 200, await self.call(lambda service: [
+                dict(recipe.to_dict(), matches=matches)
+                for recipe, matches in service.search_recipes(ingredients, mode, min_matches, limit, offset)])
+
+        if parts == ["stats"] and method == "GET":
+            limit = min(int_param(query, "limit", PAGE_SIZE), MAX_PAGE_SIZE)
+            queries = await self.call(lambda service: query_metrics.snapshot(limit))
+            return 200, {"queries": queries, "search_cache": search_cache.stats()}
+
+        raise HTTPError(404, f"Unknown endpoint: {method} {path}")
+
+    async def serve_connection(self, reader, writer):
+        # Serve Connection: Answers requests on one keep-alive connection until the client closes it.
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                url = urlsplit(target)
+                try:
+                    status, payload = await self.handle(method, url.path, parse_qs(url.query), body)
+                except HTTPError as err:
+                    status, payload = err.status, {"error": err.message}
+                except ValueError as err:
+                    status, payload = 400, {"error": str(err)}
+                except Exception as err:
+                    status, payload = 500, {"error": f"An error occurred: {err}"}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except HTTPError as err:
+            await write_response(writer, err.status, {"error": err.message}, keep_alive=False)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        await self.engine.dispose()
+
+
+def int_value(value, description):
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"Invalid {description}: '{value}'.") from None
+
+
+def int_param(query, name, default):
+    if name not in query:
+        return default
+    value = int_value(query[name][0], f"'{name}' parameter")
+    if value < 0:
+        raise HTTPError(400, f"The '{name}' parameter must not be negative.")
+    return value
+
+
+def batch_filters(query):
+    # Batch Filters: The recipe filters of a batch update or delete, e.g. ?ingredient=salt&difficulty=hard
+    return {"ingredient": query.get("ingredient", [None])[0], "difficulty": query.get("difficulty", [None])[0],
+            "min_cooking_time": int_param(query, "min_time", None), "max_cooking_time": int_param(query, "max_time", None)}
+
+
+def json_body(body):
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "The request body is not valid JSON.") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "The request body must be a JSON object.")
+    return data
+
+
+def optional_dict(recipe):
+    return None if recipe is None else recipe.to_dict()
+
+
+async def read_request(reader):
+    # Read Request: Parses the request line, headers and body. Returns None when the client has closed the connection.
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.") from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int_value(headers.get("content-length") or 0, "Content-Length header")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, "The request body is too large.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+async def write_response(writer, status, payload, keep_alive):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    head = [f"HTTP/1.1 {status} {STATUS_TEXTS.get(status, '')}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if payload is not None:
+        head.append("Content-Type: application/json")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host, port):
+    # Serve: Prepares the database with the synchronous engine, then serves the API with the async engine.
+    init_db()
+    api = RecipeAPI(recipe_app.engine.url)
+    server = await asyncio.start_server(api.serve_connection, host, port)
+    print(f"Recipe API listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the recipe app over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("--database-url", help="database to serve (default: RECIPE_DATABASE_URL or the MySQL database)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        configure_database(args.database_url)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
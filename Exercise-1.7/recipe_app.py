@@ -1,6 +1,23 @@
-from sqlalchemy import create_engine, Column, String, Integer
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.sql.expression import or_
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, case, cast, delete, event, func, inspect, or_, select, text, update, Column, String, Integer, ForeignKey, Table
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import declarative_base, relationship, scoped_session, selectinload, sessionmaker, Session as OrmSession
+from sqlalchemy.pool import SingletonThreadPool
+from sqlalchemy.schema import CreateColumn
+
+from recipe_metrics import query_metrics, enable_slow_query_log
+
+try:
+    # NumPy: Optional; used to grade large batches of recipes in one vectorized pass.
+    import numpy
+except ImportError:
+    numpy = None
 
 # Database Configuration: Set up connection parameters for the MySQL database.
 USERNAME = "cf-python"
@@ -8,16 +25,263 @@ PASSWORD = "password"
 HOST = "localhost"
 DATABASE = "task_database"
 
+# Database URL: MySQL by default. Set RECIPE_DATABASE_URL to use another backend, for example
+#   sqlite:///recipes.db  - file-backed SQLite (WAL mode), no database server needed
+#   sqlite://             - in-memory SQLite, shared by all connections of this process
+DATABASE_URL = os.environ.get("RECIPE_DATABASE_URL", f"mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}/{DATABASE}")
+
+# In-Memory Database: Shared-cache URI, so every pooled connection sees the same in-memory database.
+MEMORY_DATABASE_URL = "sqlite:///file:recipe_app?mode=memory&cache=shared&uri=true"
+
+# Page Size: Number of recipes shown at a time when browsing recipes.
+PAGE_SIZE = 10
+
+# Match Modes: A search matches recipes with "any" or "all" of the chosen ingredients,
+# or with at least a given number of them.
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+
+# Name Search: Maximum number of recipes returned by a name search, and the share of the search's
+# trigrams a recipe name must contain to be returned as a fuzzy (typo tolerant) match.
+NAME_SEARCH_LIMIT = 20
+TRIGRAM_MATCH_RATIO = 0.5
+
+# Search Cache: Ingredient search results are reused for up to SEARCH_CACHE_TTL seconds. When the cache holds
+# SEARCH_CACHE_SIZE searches, the least recently used one is dropped. Of a search matching more than
+# SEARCH_CACHE_MAX_ROWS recipes only the first SEARCH_CACHE_MAX_ROWS are cached (with the total count);
+# pages after them are read with LIMIT/OFFSET.
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_MAX_ROWS = 10000
+
+# Difficulty Rules: A recipe is quick if it cooks in under LONG_COOKING_TIME minutes and simple if it has
+# fewer than MANY_INGREDIENTS ingredients. Increase DIFFICULTY_RULES_VERSION whenever the rules change, so
+# recompute_difficulties() re-grades the recipes graded under the old rules.
+LONG_COOKING_TIME = 10
+MANY_INGREDIENTS = 4
+DIFFICULTY_RULES_VERSION = 1
+
+# Connection Pool: Connections are reused across operations instead of opened per request.
+#   POOL_SIZE     - connections kept open in the pool
+#   MAX_OVERFLOW  - extra connections allowed under load, closed again when returned
+#   POOL_TIMEOUT  - seconds to wait for a free connection before giving up
+#   POOL_RECYCLE  - seconds after which a connection is replaced (before the server drops it)
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30
+POOL_RECYCLE = 1800
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # SQLite Pragmas: WAL lets readers run alongside a writer, NORMAL sync is safe in WAL mode and
+    # avoids an fsync per commit, and foreign keys make the ON DELETE CASCADE rules apply.
+    cursor = dbapi_connection.cursor()
+    if not connection_record.info.get("in_memory"):
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_recipe_engine(url=DATABASE_URL):
+    # Create Engine: Builds the engine for the configured backend.
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        # Server databases use a connection pool. pool_pre_ping checks each connection before use,
+        # so a dropped connection is replaced instead of failing.
+        return create_engine(
+            url,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            pool_recycle=POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+
+    in_memory = url.database in (None, "", ":memory:")
+    if in_memory:
+        # In-memory SQLite: one connection per thread, all attached to the same shared-cache database,
+        # which lives until the engine is disposed.
+        new_engine = create_engine(MEMORY_DATABASE_URL, poolclass=SingletonThreadPool)
+    else:
+        new_engine = create_engine(url)
+
+    @event.listens_for(new_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["in_memory"] = in_memory
+        set_sqlite_pragmas(dbapi_connection, connection_record)
+
+    return new_engine
+
+
 # SQLAlchemy Engine: Create the engine to manage connections to the database.
-engine = create_engine(f"mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}/{DATABASE}")
+engine = create_recipe_engine()
 
 # Base Class: All model classes will inherit from this class.
 Base = declarative_base()
 
 # Session: Set up the mechanism to talk to the database. 
-# The session will be used to query and commit transactions.
-Session = sessionmaker(bind=engine)
-session = Session()
+# Sessions are scoped to the current thread; every operation uses its own short-lived session
+# through session_scope(), so no session (or connection) is shared between operations.
+Session = scoped_session(sessionmaker(bind=engine))
+
+
+@contextmanager
+def session_scope():
+    # Session Scope: Provides a session for one operation. Commits on success, rolls back on error
+    # and always returns the connection to the pool.
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        Session.remove()
+
+
+class SearchCache:
+    # Search Cache: LRU cache with expiry of ingredient search results, shared by every session of the process.
+    # A search is keyed by its set of normalized ingredient names and the number of them a recipe must match,
+    # and its value is the number of matching recipes and the first (at most SEARCH_CACHE_MAX_ROWS) ranked
+    # (recipe_id, matches) rows. An index from ingredient name to keys lets
+    # a write drop exactly the searches that involve the ingredients it changed.
+
+    def __init__(self, max_size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.keys_by_ingredient = {}
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self.remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            for name in key[0]:
+                self.keys_by_ingredient.setdefault(name, set()).add(key)
+            while len(self.entries) > self.max_size:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def remove(self, key):
+        # Remove: Drops one entry and its ingredient index entries. The caller holds the lock.
+        del self.entries[key]
+        for name in key[0]:
+            keys = self.keys_by_ingredient.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_by_ingredient[name]
+
+    def invalidate(self, names):
+        # Invalidate: Drops every cached search that involves one of the ingredient names.
+        with self.lock:
+            for name in names:
+                for key in list(self.keys_by_ingredient.get(name, ())):
+                    self.remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_ingredient.clear()
+
+    def stats(self):
+        # Stats: Counters for monitoring; hit_ratio is the share of lookups answered from the cache.
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "hit_ratio": self.hits / lookups if lookups else 0.0,
+                    "invalidations": self.invalidations, "evictions": self.evictions}
+
+
+search_cache = SearchCache()
+
+
+def mark_ingredients_changed(session, names):
+    # Mark Ingredients Changed: Called by every write that adds or removes recipe links of these ingredients.
+    # Their cached searches are dropped now, and again when the transaction ends, so a search cached by another
+    # session before the commit cannot outlive it.
+    names = set(names)
+    session.info.setdefault("changed_ingredients", set()).update(names)
+    search_cache.invalidate(names)
+
+
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_rollback")
+def invalidate_changed_searches(session):
+    names = session.info.pop("changed_ingredients", None)
+    if names:
+        search_cache.invalidate(names)
+
+
+# Query Metrics: Every statement of every engine is measured (see recipe_metrics.py). Set RECIPE_SLOW_QUERY_LOG
+# to a file name to log the statements slower than RECIPE_SLOW_QUERY_MS milliseconds to that file.
+query_metrics.install()
+if os.environ.get("RECIPE_SLOW_QUERY_LOG"):
+    enable_slow_query_log(os.environ["RECIPE_SLOW_QUERY_LOG"])
+
+
+def configure_database(url):
+    # Configure Database: Switches the app to another database URL, e.g. for tools, tests and benchmarks.
+    global engine
+    engine.dispose()
+    engine = create_recipe_engine(url)
+    Session.remove()
+    Session.configure(bind=engine)
+    search_cache.clear()
+    return engine
+
+# Association Table: Links each recipe to its normalized ingredients (many-to-many).
+# The composite primary key covers lookups by recipe, the extra index covers lookups by ingredient.
+recipe_ingredients = Table(
+    "recipe_ingredients",
+    Base.metadata,
+    Column("recipe_id", Integer, ForeignKey("final_recipes.id", ondelete="CASCADE"), primary_key=True),
+    Column("ingredient_id", Integer, ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+
+# Name Trigrams: Every three-letter sequence of each recipe name, for typo tolerant name search.
+# The primary key covers lookups by trigram, the extra index covers rewriting a recipe's trigrams.
+recipe_name_trigrams = Table(
+    "recipe_name_trigrams",
+    Base.metadata,
+    Column("trigram", String(3), primary_key=True),
+    Column("recipe_id", Integer, ForeignKey("final_recipes.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+
+class Ingredient(Base):
+    # Table Name: One row per distinct (normalized) ingredient name.
+    __tablename__ = "ingredients"
+
+    # Columns: The name is unique and indexed so ingredient lookups never scan the table.
+    # recipe_count is kept up to date on every create, update and delete, so the search menu
+    # can list the ingredients in use without scanning the recipes.
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False, unique=True, index=True)
+    recipe_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<Ingredient(id={self.id}, name={self.name}, recipe_count={self.recipe_count})>"
+
 
 class Recipe(Base):
     # Table Name: Define the name of the table in the database.
@@ -28,7 +292,15 @@ class Recipe(Base):
     name = Column(String(50))
     ingredients = Column(String(255))
     cooking_time = Column(Integer)
-    difficulty = Column(String(20))
+    # Difficulty: Stored (and indexed) when a recipe is written, together with the version of the rules used
+    # and the number of ingredients, so it can be filtered on and re-graded in SQL without loading recipes.
+    difficulty = Column(String(20), index=True)
+    difficulty_version = Column(Integer, index=True)
+    ingredient_count = Column(Integer)
+
+    # Relationship: The normalized ingredients of this recipe, stored in the recipe_ingredients table.
+    # Loaded on first access only; the code paths that rewrite the links load them with selectinload().
+    ingredient_items = relationship(Ingredient, secondary=recipe_ingredients)
 
     def __repr__(self):
         # Representation: Used for debugging purposes, showing a quick string representation of the object.
@@ -47,15 +319,18 @@ class Recipe(Base):
     
     def calculate_difficulty(self):
         # Calculate Difficulty: Determines the recipe's difficulty based on cooking time and number of ingredients.
+        # Called whenever the cooking time or ingredients change; displaying a recipe only reads the stored value.
         num_ingredients = len(self.return_ingredients_as_list())
-        if self.cooking_time < 10 and num_ingredients < 4:
+        if self.cooking_time < LONG_COOKING_TIME and num_ingredients < MANY_INGREDIENTS:
             self.difficulty = "Easy"
-        elif self.cooking_time < 10 and num_ingredients >= 4:
+        elif self.cooking_time < LONG_COOKING_TIME and num_ingredients >= MANY_INGREDIENTS:
             self.difficulty = "Medium"
-        elif self.cooking_time >= 10 and num_ingredients < 4:
+        elif self.cooking_time >= LONG_COOKING_TIME and num_ingredients < MANY_INGREDIENTS:
             self.difficulty = "Intermediate"
-        elif self.cooking_time >= 10 and num_ingredients >= 4:
+        elif self.cooking_time >= LONG_COOKING_TIME and num_ingredients >= MANY_INGREDIENTS:
             self.difficulty = "Hard"
+        self.ingredient_count = num_ingredients
+        self.difficulty_version = DIFFICULTY_RULES_VERSION
 
     def return_ingredients_as_list(self):
         # Convert Ingredients to List: Splits the ingredients string into a list for easier manipulation.
@@ -63,11 +338,602 @@ class Recipe(Base):
             return []
         return self.ingredients.split(", ")
 
-# Create Tables: Execute the creation of tables in the database based on the models defined.   
-Base.metadata.create_all(engine)
+    def to_dict(self):
+        # Dictionary Representation: Plain data for JSON responses.
+        return {"id": self.id,
+                "name": self.name,
+                "ingredients": self.return_ingredients_as_list(),
+                "cooking_time": self.cooking_time,
+                "difficulty": self.difficulty}
+
+
+# Difficulty Levels: Indexed by (cooking_time >= LONG_COOKING_TIME) * 2 + (number of ingredients >= MANY_INGREDIENTS).
+DIFFICULTY_LEVELS = ("Easy", "Medium", "Intermediate", "Hard")
+
+
+def classify_difficulties(cooking_times, ingredient_counts):
+    # Classify Difficulties: Grades a whole batch at once and returns difficulty codes, i.e. indexes into
+    # DIFFICULTY_LEVELS (long cooking time adds 2, many ingredients adds 1). With NumPy this is a handful of
+    # array operations (a uint8 array is returned); without it, the codes are built as bytes in one pass.
+    if numpy is not None:
+        long_cooking = numpy.asarray(cooking_times) >= LONG_COOKING_TIME
+        many_ingredients = numpy.asarray(ingredient_counts) >= MANY_INGREDIENTS
+        return long_cooking.astype(numpy.uint8) * 2 + many_ingredients
+    return bytes((cooking_time >= LONG_COOKING_TIME) * 2 + (num_ingredients >= MANY_INGREDIENTS)
+                 for cooking_time, num_ingredients in zip(cooking_times, ingredient_counts))
+
+
+def calculate_difficulties(cooking_times, ingredient_counts):
+    # Batch Difficulty: Grades a whole batch of recipes in one pass, using the same rules as
+    # Recipe.calculate_difficulty() but without building a Recipe object per row.
+    codes = classify_difficulties(cooking_times, ingredient_counts)
+    if numpy is not None:
+        return numpy.array(DIFFICULTY_LEVELS, dtype=object)[codes].tolist()
+    return [DIFFICULTY_LEVELS[code] for code in codes]
+
+
+def difficulty_expression(cooking_time, ingredient_count):
+    # Difficulty Expression: The difficulty rules as a SQL CASE expression, for set-based updates.
+    return case(
+        (cooking_time < LONG_COOKING_TIME,
+         case((ingredient_count < MANY_INGREDIENTS, DIFFICULTY_LEVELS[0]), else_=DIFFICULTY_LEVELS[1])),
+        else_=case((ingredient_count < MANY_INGREDIENTS, DIFFICULTY_LEVELS[2]), else_=DIFFICULTY_LEVELS[3]),
+    )
+
+
+def recompute_difficulties(session):
+    # Recompute Difficulties: Re-grades, with set-based UPDATEs, only the recipes that were graded under older
+    # rules (or never graded). Recipes already graded under DIFFICULTY_RULES_VERSION are not touched.
+    # Returns the number of re-graded recipes.
+    stale = or_(Recipe.difficulty_version.is_(None), Recipe.difficulty_version < DIFFICULTY_RULES_VERSION)
+
+    # Recipes stored before ingredient_count existed get it from their linked ingredients.
+    linked_ingredients = (select(func.count())
+                          .select_from(recipe_ingredients)
+                          .where(recipe_ingredients.c.recipe_id == Recipe.id)
+                          .scalar_subquery())
+    session.execute(update(Recipe)
+                    .where(stale, Recipe.ingredient_count.is_(None))
+                    .values(ingredient_count=linked_ingredients)
+                    .execution_options(synchronize_session=False))
+
+    result = session.execute(update(Recipe)
+                             .where(stale, Recipe.cooking_time.isnot(None))
+                             .values(difficulty=difficulty_expression(Recipe.cooking_time, Recipe.ingredient_count),
+                                     difficulty_version=DIFFICULTY_RULES_VERSION)
+                             .execution_options(synchronize_session=False))
+    session.commit()
+    return result.rowcount
+
+
+def normalize_ingredient(ingredient):
+    # Normalize Ingredient: Ingredients are matched case-insensitively and without surrounding whitespace.
+    return " ".join(ingredient.split()).lower()
+
+
+def parse_ingredients(ingredients):
+    # Parse Ingredients: Splits a comma separated string into normalized, de-duplicated ingredient names.
+    # The first occurrence of each ingredient keeps its position.
+    names = (normalize_ingredient(ingredient) for ingredient in ingredients.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def get_or_create_ingredients(session, names):
+    # Get or Create Ingredients: Looks up all names with a single indexed query and creates the missing ones.
+    if not names:
+        return []
+    existing = {ingredient.name: ingredient for ingredient in session.query(Ingredient).filter(Ingredient.name.in_(names))}
+    for name in names:
+        if name not in existing:
+            existing[name] = Ingredient(name=name)
+            session.add(existing[name])
+    return [existing[name] for name in names]
+
+
+def adjust_recipe_count(ingredient, delta):
+    # Adjust Recipe Count: New ingredients get a plain value; stored ones get an atomic
+    # "recipe_count = recipe_count + delta" update when the session is flushed.
+    if inspect(ingredient).pending:
+        ingredient.recipe_count = (ingredient.recipe_count or 0) + delta
+    else:
+        ingredient.recipe_count = Ingredient.recipe_count + delta
+
+
+def sync_recipe_ingredients(session, recipe):
+    # Sync Ingredients: Rebuilds the recipe's links in the recipe_ingredients table from its ingredients string
+    # and moves the recipe counts of the ingredients that were added or removed.
+    if inspect(recipe).persistent and "ingredient_items" in inspect(recipe).unloaded:
+        session.execute(select(Recipe).where(Recipe.id == recipe.id).options(selectinload(Recipe.ingredient_items)))
+    old_items = set(recipe.ingredient_items)
+    new_items = get_or_create_ingredients(session, parse_ingredients(recipe.ingredients or ""))
+    for ingredient in old_items.difference(new_items):
+        adjust_recipe_count(ingredient, -1)
+    for ingredient in set(new_items).difference(old_items):
+        adjust_recipe_count(ingredient, 1)
+    mark_ingredients_changed(session, (ingredient.name for ingredient in old_items.symmetric_difference(new_items)))
+    recipe.ingredient_items = new_items
+
+
+def delete_recipe_with_ingredients(session, recipe):
+    # Delete Recipe: Removes the recipe and decrements the recipe counts of its ingredients.
+    for ingredient in recipe.ingredient_items:
+        adjust_recipe_count(ingredient, -1)
+    mark_ingredients_changed(session, (ingredient.name for ingredient in recipe.ingredient_items))
+    session.delete(recipe)
+
+
+def refresh_ingredient_counts(session):
+    # Refresh Counts: Recomputes every recipe count with one set-based UPDATE.
+    # Only needed once after upgrading an existing database; afterwards the counts are maintained incrementally.
+    linked_recipes = (select(func.count())
+                      .select_from(recipe_ingredients)
+                      .where(recipe_ingredients.c.ingredient_id == Ingredient.id)
+                      .scalar_subquery())
+    session.execute(update(Ingredient).values(recipe_count=linked_recipes))
+    session.commit()
+
+
+def iter_ingredient_pages(session, page_size=PAGE_SIZE, last_name=""):
+    # Ingredient Pages: Lists the ingredients used by at least one recipe in name order, one page at a time,
+    # using keyset pagination on the indexed name column.
+    while True:
+        page = (session.query(Ingredient)
+                .filter(Ingredient.recipe_count > 0, Ingredient.name > last_name)
+                .order_by(Ingredient.name)
+                .limit(page_size)
+                .all())
+        if not page:
+            return
+        yield page
+        last_name = page[-1].name
+
+
+def migrate_ingredients(session, batch_size=1000):
+    # Migrate Ingredients: Backfills the normalized tables for recipes created before they existed.
+    # Only recipes without any linked ingredient are visited, so running it again is cheap.
+    migrated = 0
+    last_id = 0
+    while True:
+        recipes = (session.query(Recipe)
+                   .options(selectinload(Recipe.ingredient_items))
+                   .filter(Recipe.id > last_id, ~Recipe.ingredient_items.any())
+                   .order_by(Recipe.id)
+                   .limit(batch_size)
+                   .all())
+        if not recipes:
+            break
+        for recipe in recipes:
+            sync_recipe_ingredients(session, recipe)
+        session.commit()
+        migrated += len(recipes)
+        last_id = recipes[-1].id
+    return migrated
+
+
+def iter_recipe_pages(session, page_size=PAGE_SIZE, after_id=0, difficulty=None):
+    # Recipe Pages: Keyset pagination (WHERE id > last ORDER BY id LIMIT n), so every page is an
+    # index range scan and only one page of recipes is held in memory at a time.
+    # With a difficulty the pages come from the difficulty index.
+    query = session.query(Recipe)
+    if difficulty is not None:
+        query = query.filter(Recipe.difficulty == difficulty)
+    while True:
+        page = (query
+                .filter(Recipe.id > after_id)
+                .order_by(Recipe.id)
+                .limit(page_size)
+                .all())
+        if not page:
+            return
+        yield page
+        after_id = page[-1].id
+
+
+def stream_recipes(session, batch_size=1000):
+    # Stream Recipes: Iterates over every recipe for non-interactive use (exports, reports), fetching
+    # batch_size rows at a time instead of materializing the whole table.
+    return session.query(Recipe).order_by(Recipe.id).yield_per(batch_size)
+
+
+def has_recipes(session):
+    # Has Recipes: Checks for at least one recipe without loading the table.
+    return session.query(Recipe.id).first() is not None
+
+
+def name_trigrams(name):
+    # Name Trigrams: The set of three-letter sequences of each word in the name. Words are padded (two spaces
+    # in front, one behind) so short words and word starts still produce trigrams, as in PostgreSQL's pg_trgm.
+    trigrams = set()
+    for word in re.findall(r"\w+", name.lower()):
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def sync_name_trigrams(session, recipe):
+    # Sync Name Trigrams: Rewrites the trigram rows of a recipe after its name was set or changed.
+    session.flush()
+    session.execute(delete(recipe_name_trigrams).where(recipe_name_trigrams.c.recipe_id == recipe.id))
+    rows = [{"trigram": trigram, "recipe_id": recipe.id} for trigram in name_trigrams(recipe.name or "")]
+    if rows:
+        session.execute(recipe_name_trigrams.insert(), rows)
+
+
+def migrate_name_trigrams(session, batch_size=1000):
+    # Migrate Name Trigrams: Builds the trigram rows of recipes stored before name search existed.
+    has_trigrams = select(recipe_name_trigrams.c.recipe_id).where(recipe_name_trigrams.c.recipe_id == Recipe.id).exists()
+    last_id = 0
+    while True:
+        recipes = (session.query(Recipe.id, Recipe.name)
+                   .filter(Recipe.id > last_id, ~has_trigrams)
+                   .order_by(Recipe.id)
+                   .limit(batch_size)
+                   .all())
+        if not recipes:
+            break
+        rows = [{"trigram": trigram, "recipe_id": recipe_id}
+                for recipe_id, name in recipes for trigram in name_trigrams(name or "")]
+        if rows:
+            session.execute(recipe_name_trigrams.insert(), rows)
+        session.commit()
+        last_id = recipes[-1].id
+
+
+def create_name_search_index(engine):
+    # Full-Text Index: SQLite gets an FTS5 table kept in sync with final_recipes by triggers,
+    # MySQL a FULLTEXT index on the name column. Other databases only use the trigram search.
+    with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'recipe_name_fts'")).first()
+            if exists:
+                return
+            connection.execute(text("CREATE VIRTUAL TABLE recipe_name_fts USING fts5(name, content='final_recipes', content_rowid='id')"))
+            connection.execute(text("CREATE TRIGGER recipe_name_fts_insert AFTER INSERT ON final_recipes BEGIN "
+                                    "INSERT INTO recipe_name_fts(rowid, name) VALUES (new.id, new.name); END"))
+            connection.execute(text("CREATE TRIGGER recipe_name_fts_delete AFTER DELETE ON final_recipes BEGIN "
+                                    "INSERT INTO recipe_name_fts(recipe_name_fts, rowid, name) VALUES ('delete', old.id, old.name); END"))
+            connection.execute(text("CREATE TRIGGER recipe_name_fts_update AFTER UPDATE OF name ON final_recipes BEGIN "
+                                    "INSERT INTO recipe_name_fts(recipe_name_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+                                    "INSERT INTO recipe_name_fts(rowid, name) VALUES (new.id, new.name); END"))
+            connection.execute(text("INSERT INTO recipe_name_fts(recipe_name_fts) VALUES ('rebuild')"))
+        elif engine.dialect.name == "mysql":
+            indexes = {index["name"] for index in inspect(connection).get_indexes("final_recipes")}
+            if "ft_final_recipes_name" not in indexes:
+                connection.execute(text("ALTER TABLE final_recipes ADD FULLTEXT INDEX ft_final_recipes_name (name)"))
+
+
+def full_text_name_search(session, query, limit):
+    # Full-Text Name Search: IDs of recipes whose name contains words starting with every word of the query,
+    # best matches first. Returns None if the database has no full-text index.
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return []
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{word}"*' for word in words)
+        statement = text("SELECT rowid FROM recipe_name_fts WHERE recipe_name_fts MATCH :match ORDER BY rank LIMIT :limit")
+    elif dialect == "mysql":
+        match = " ".join(f"+{word}*" for word in words)
+        statement = text("SELECT id FROM final_recipes WHERE MATCH(name) AGAINST (:match IN BOOLEAN MODE) "
+                         "ORDER BY MATCH(name) AGAINST (:match IN BOOLEAN MODE) DESC LIMIT :limit")
+    else:
+        return None
+    return [recipe_id for (recipe_id,) in session.execute(statement, {"match": match, "limit": limit})]
+
+
+def trigram_name_search(session, query, limit):
+    # Trigram Name Search: IDs of recipes whose names share the most trigrams with the query, so names
+    # with typos are still found. Uses the primary key of recipe_name_trigrams; no recipe row is read.
+    trigrams = name_trigrams(query)
+    if not trigrams:
+        return []
+    shared = func.count().label("shared")
+    statement = (select(recipe_name_trigrams.c.recipe_id, shared)
+                 .where(recipe_name_trigrams.c.trigram.in_(trigrams))
+                 .group_by(recipe_name_trigrams.c.recipe_id)
+                 .having(func.count() >= max(1, round(len(trigrams) * TRIGRAM_MATCH_RATIO)))
+                 .order_by(shared.desc(), recipe_name_trigrams.c.recipe_id)
+                 .limit(limit))
+    return [recipe_id for recipe_id, _ in session.execute(statement)]
+
+
+def upgrade_schema(engine):
+    # Upgrade Schema: create_all() only creates missing tables, so columns and indexes added to an
+    # existing table are created here. Returns the added columns as "table.column" strings.
+    added = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_spec = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_spec}"))
+                    added.append(f"{table.name}.{column.name}")
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+    return added
+
+
+def init_db():
+    # Initialize Database: Creates the tables defined by the models, upgrades tables created by older
+    # versions of the app and links recipes that predate the ingredient tables.
+    Base.metadata.create_all(engine)
+    added_columns = upgrade_schema(engine)
+    create_name_search_index(engine)
+    with session_scope() as session:
+        if "ingredients.recipe_count" in added_columns:
+            refresh_ingredient_counts(session)
+        migrate_ingredients(session)
+        migrate_name_trigrams(session)
+        recompute_difficulties(session)
+    search_cache.clear()
+
+
+def clean_name(name):
+    # Clean Name: Recipe names are 1-50 characters long.
+    name = str(name).strip()
+    if not 0 < len(name) <= 50:
+        raise ValueError("Please enter a valid recipe name (1-50 characters).")
+    return name
+
+
+def clean_cooking_time(cooking_time):
+    # Clean Cooking Time: Cooking times are positive whole minutes.
+    try:
+        cooking_time = int(cooking_time)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid input. Please enter a positive number for cooking time.") from None
+    if cooking_time <= 0:
+        raise ValueError("Please enter a positive number for cooking time.")
+    return cooking_time
+
+
+def clean_ingredients(ingredients):
+    # Clean Ingredients: Accepts a comma separated string or a list and returns the stored string form.
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(",")
+    ingredients = [" ".join(str(ingredient).split()) for ingredient in ingredients]
+    ingredients = [ingredient for ingredient in ingredients if ingredient]
+    if not ingredients:
+        raise ValueError("Please enter at least one ingredient.")
+    return ", ".join(ingredients)
+
+
+class RecipeService:
+    # Recipe Service: Every recipe operation without any input() or print(), so the same code serves
+    # the command line menu and the HTTP API. Methods flush but never commit; the caller owns the transaction.
+    # Invalid values raise ValueError with a message that can be shown to the user.
+
+    def __init__(self, session):
+        self.session = session
+
+    def has_recipes(self):
+        return has_recipes(self.session)
+
+    def get_recipe(self, recipe_id):
+        # Get Recipe: Returns the recipe with the given ID, or None.
+        return self.session.get(Recipe, recipe_id)
+
+    def list_recipes(self, after_id=0, limit=PAGE_SIZE, difficulty=None):
+        # List Recipes: One page of recipes in ID order, starting after after_id, optionally of one difficulty only.
+        if difficulty is not None and difficulty.title() not in DIFFICULTY_LEVELS:
+            raise ValueError(f"Invalid difficulty. Please choose one of: {', '.join(DIFFICULTY_LEVELS)}.")
+        if difficulty is not None:
+            difficulty = difficulty.title()
+        return next(iter_recipe_pages(self.session, limit, after_id, difficulty), [])
+
+    def list_ingredients(self, after_name="", limit=PAGE_SIZE):
+        # List Ingredients: One page of the ingredients in use, in name order, starting after after_name.
+        return next(iter_ingredient_pages(self.session, limit, after_name), [])
+
+    def create_recipe(self, name, cooking_time, ingredients):
+        # Create Recipe: Validates the values, stores the recipe and links its ingredients.
+        recipe = Recipe(name=clean_name(name),
+                        cooking_time=clean_cooking_time(cooking_time),
+                        ingredients=clean_ingredients(ingredients))
+        recipe.calculate_difficulty()
+        self.session.add(recipe)
+        sync_recipe_ingredients(self.session, recipe)
+        sync_name_trigrams(self.session, recipe)
+        return recipe
+
+    def update_recipe(self, recipe_id, name=None, cooking_time=None, ingredients=None):
+        # Update Recipe: Changes the given fields and recalculates the difficulty. Returns None if there is no such recipe.
+        recipe = self.get_recipe(recipe_id)
+        if recipe is None:
+            return None
+        if name is not None:
+            recipe.name = clean_name(name)
+            sync_name_trigrams(self.session, recipe)
+        if cooking_time is not None:
+            recipe.cooking_time = clean_cooking_time(cooking_time)
+        if ingredients is not None:
+            recipe.ingredients = clean_ingredients(ingredients)
+            sync_recipe_ingredients(self.session, recipe)
+        if cooking_time is not None or ingredients is not None:
+            recipe.calculate_difficulty()
+        self.session.flush()
+        return recipe
+
+    def delete_recipe(self, recipe_id):
+        # Delete Recipe: Returns False if there is no such recipe.
+        recipe = self.get_recipe(recipe_id)
+        if recipe is None:
+            return False
+        self.session.execute(delete(recipe_name_trigrams).where(recipe_name_trigrams.c.recipe_id == recipe_id))
+        delete_recipe_with_ingredients(self.session, recipe)
+        self.session.flush()
+        return True
+
+    def recipe_conditions(self, ingredient=None, difficulty=None, min_cooking_time=None, max_cooking_time=None):
+        # Recipe Conditions: WHERE conditions on final_recipes for a batch operation. Returns None when the
+        # ingredient does not exist (so nothing can match). At least one filter is required, so a batch
+        # operation never touches every recipe by accident.
+        if ingredient is None and difficulty is None and min_cooking_time is None and max_cooking_time is None:
+            raise ValueError("Please choose at least one filter: ingredient, difficulty or cooking time.")
+        conditions = []
+        if ingredient is not None:
+            # The ingredient is resolved to its id first, so no statement below has to join the ingredients
+            # table (MySQL does not allow an UPDATE of ingredients to select from ingredients).
+            ingredient_id = self.session.execute(
+                select(Ingredient.id).where(Ingredient.name == normalize_ingredient(ingredient))).scalar()
+            if ingredient_id is None:
+                return None
+            conditions.append(Recipe.id.in_(select(recipe_ingredients.c.recipe_id)
+                                            .where(recipe_ingredients.c.ingredient_id == ingredient_id)))
+        if difficulty is not None:
+            if difficulty.title() not in DIFFICULTY_LEVELS:
+                raise ValueError(f"Invalid difficulty. Please choose one of: {', '.join(DIFFICULTY_LEVELS)}.")
+            conditions.append(Recipe.difficulty == difficulty.title())
+        if min_cooking_time is not None:
+            conditions.append(Recipe.cooking_time >= min_cooking_time)
+        if max_cooking_time is not None:
+            conditions.append(Recipe.cooking_time <= max_cooking_time)
+        return conditions
+
+    def delete_recipes(self, **filters):
+        # Delete Recipes: Deletes every recipe matching the filters (see recipe_conditions()) with set-based
+        # statements; no recipe is loaded. Returns the number of deleted recipes.
+        conditions = self.recipe_conditions(**filters)
+        if conditions is None:
+            return 0
+        targets = select(Recipe.id).where(*conditions)
+        linked = select(recipe_ingredients.c.ingredient_id).where(recipe_ingredients.c.recipe_id.in_(targets))
+
+        # Only the names of the affected ingredients are read, to drop exactly their cached searches.
+        mark_ingredients_changed(self.session, self.session.execute(
+            select(Ingredient.name).where(Ingredient.id.in_(linked))).scalars())
+        removed_links = (select(func.count())
+                         .select_from(recipe_ingredients)
+                         .where(recipe_ingredients.c.ingredient_id == Ingredient.id,
+                                recipe_ingredients.c.recipe_id.in_(targets))
+                         .scalar_subquery())
+        self.session.execute(update(Ingredient)
+                             .where(Ingredient.id.in_(linked))
+                             .values(recipe_count=Ingredient.recipe_count - removed_links)
+                             .execution_options(synchronize_session=False))
+        self.session.execute(delete(recipe_name_trigrams).where(recipe_name_trigrams.c.recipe_id.in_(targets)))
+        # The recipe_ingredients rows go with the recipes (ON DELETE CASCADE).
+        deleted = self.session.execute(delete(Recipe)
+                                       .where(*conditions)
+                                       .execution_options(synchronize_session=False)).rowcount
+        self.session.expire_all()
+        return deleted
+
+    def scale_cooking_times(self, factor, **filters):
+        # Scale Cooking Times: Multiplies the cooking time of every recipe matching the filters (rounded, at least
+        # one minute) and regrades their difficulty, in one UPDATE. Returns the number of updated recipes.
+        try:
+            factor = float(factor)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid factor. Please enter a positive number.") from None
+        if not factor > 0:
+            raise ValueError("Please enter a positive number for the factor.")
+        conditions = self.recipe_conditions(**filters)
+        if conditions is None:
+            return 0
+        scaled = cast(func.round(Recipe.cooking_time * factor), Integer)
+        new_cooking_time = case((scaled < 1, 1), else_=scaled)
+        updated = self.session.execute(update(Recipe)
+                                       .where(*conditions)
+                                       .values(cooking_time=new_cooking_time,
+                                               difficulty=difficulty_expression(new_cooking_time, Recipe.ingredient_count),
+                                               difficulty_version=DIFFICULTY_RULES_VERSION)
+                                       .execution_options(synchronize_session=False)).rowcount
+        self.session.expire_all()
+        return updated
+
+    def search_by_name(self, query, limit=NAME_SEARCH_LIMIT):
+        # Search By Name: Full-text search on the recipe name, falling back to trigram (typo tolerant) search
+        # when the full-text index finds nothing or does not exist. Returns recipes, best matches first.
+        recipe_ids = full_text_name_search(self.session, query, limit)
+        if not recipe_ids:
+            recipe_ids = trigram_name_search(self.session, query, limit)
+        if not recipe_ids:
+            return []
+        recipes = {recipe.id: recipe for recipe in self.session.query(Recipe).filter(Recipe.id.in_(recipe_ids))}
+        return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
+
+    def search_terms(self, ingredients, mode=MATCH_ANY, min_matches=None):
+        # Search Terms: The normalized, distinct ingredient names and the number of them a recipe must contain.
+        names = list(dict.fromkeys(normalize_ingredient(ingredient) for ingredient in ingredients))
+        names = [name for name in names if name]
+        if not names:
+            raise ValueError("Please choose at least one ingredient.")
+        if min_matches is None:
+            if mode not in (MATCH_ANY, MATCH_ALL):
+                raise ValueError(f"Invalid match mode. Please choose '{MATCH_ANY}' or '{MATCH_ALL}'.")
+            min_matches = len(names) if mode == MATCH_ALL else 1
+        if not 1 <= min_matches <= len(names):
+            raise ValueError(f"The number of matching ingredients must be between 1 and {len(names)}.")
+        return names, min_matches
+
+    def match_counts(self, ingredients, mode=MATCH_ANY, min_matches=None):
+        # Match Counts: Subquery of (recipe_id, matches) for the recipes that contain enough of the given ingredients.
+        # It is a GROUP BY ... HAVING COUNT over the indexed recipe_ingredients table; no recipe row is read.
+        names, min_matches = self.search_terms(ingredients, mode, min_matches)
+        return (select(recipe_ingredients.c.recipe_id, func.count().label("matches"))
+                .join(Ingredient, Ingredient.id == recipe_ingredients.c.ingredient_id)
+                .where(Ingredient.name.in_(names))
+                .group_by(recipe_ingredients.c.recipe_id)
+                .having(func.count() >= min_matches)
+                .subquery())
+
+    def ranked_matches(self, names, min_matches):
+        # Ranked Matches: Query of the (recipe_id, matches) rows of a search, most matches first.
+        matches = self.match_counts(names, min_matches=min_matches)
+        return select(matches.c.recipe_id, matches.c.matches).order_by(matches.c.matches.desc(), matches.c.recipe_id)
+
+    def cached_matches(self, ingredients, mode=MATCH_ANY, min_matches=None):
+        # Cached Matches: The search terms, the number of matching recipes and the first SEARCH_CACHE_MAX_ROWS
+        # ranked (recipe_id, matches) rows, from the search cache when possible. A session with uncommitted
+        # ingredient changes neither reads nor fills the cache.
+        names, min_matches = self.search_terms(ingredients, mode, min_matches)
+        key = (frozenset(names), min_matches)
+        uncommitted = bool(self.session.info.get("changed_ingredients"))
+        entry = None if uncommitted else search_cache.get(key)
+        if entry is None:
+            ranked = self.ranked_matches(names, min_matches)
+            rows = tuple((recipe_id, matches_count) for recipe_id, matches_count in
+                         self.session.execute(ranked.limit(SEARCH_CACHE_MAX_ROWS + 1)))
+            if len(rows) > SEARCH_CACHE_MAX_ROWS:
+                rows = rows[:SEARCH_CACHE_MAX_ROWS]
+                total = self.session.execute(select(func.count()).select_from(ranked.subquery())).scalar()
+            else:
+                total = len(rows)
+            entry = (total, rows)
+            if not uncommitted:
+                search_cache.put(key, entry)
+        return names, min_matches, entry
+
+    def search_recipes(self, ingredients, mode=MATCH_ANY, min_matches=None, limit=None, offset=0):
+        # Search Recipes: Recipes that contain any, all, or at least min_matches of the given ingredients,
+        # ranked by how many of them they contain. Returns a list of (recipe, matches) pairs.
+        # Pages within the cached rows are sliced from them; later pages run the search with LIMIT/OFFSET.
+        names, min_matches, (total, cached_rows) = self.cached_matches(ingredients, mode, min_matches)
+        end = total if limit is None else min(offset + limit, total)
+        if end <= len(cached_rows):
+            rows = cached_rows[offset:end]
+        elif offset < total:
+            ranked = self.ranked_matches(names, min_matches).offset(offset)
+            rows = self.session.execute(ranked if limit is None else ranked.limit(limit)).all()
+        else:
+            rows = ()
+        if not rows:
+            return []
+        recipes = {recipe.id: recipe for recipe in
+                   self.session.query(Recipe).filter(Recipe.id.in_([recipe_id for recipe_id, _ in rows]))}
+        return [(recipes[recipe_id], matches_count) for recipe_id, matches_count in rows if recipe_id in recipes]
 
+    def count_search_results(self, ingredients, mode=MATCH_ANY, min_matches=None):
+        # Count Search Results: Number of recipes search_recipes() would return without a limit (cached).
+        return self.cached_matches(ingredients, mode, min_matches)[2][0]
 
-def create_recipe():
+def create_recipe(session):
     # Display the header for the create recipe function.
     print()
     print("==================================================")
@@ -119,13 +985,9 @@ def create_recipe():
                 else:
                     print("Please enter at least one ingredient.\n")
 
-        # Create a new recipe instance and add it to the session.
-        new_recipe = Recipe(name=name, ingredients=ingredients_input, cooking_time=cooking_time)
-        new_recipe.calculate_difficulty()
-
-        # Add the new recipe to the session and attempt to commit it to the database.
-        session.add(new_recipe)
+        # Create the new recipe through the service and attempt to commit it to the database.
         try:
+            RecipeService(session).create_recipe(name, cooking_time, ingredients_input)
             session.commit()
             print("  ** Recipe successfully added! **")
 
@@ -145,12 +1007,9 @@ def create_recipe():
     pause()
 
 
-def view_all_recipes():
-    # Retrieve all recipes from the database.
-    recipes = session.query(Recipe).all()
-
+def view_all_recipes(session):
     # Check if there are any recipes in the database, and display a message if there are none.
-    if not recipes:
+    if not has_recipes(session):
         print("***************************************************************")
         print("         There are no recipes in the database to view.         ")
         print("                 Please create a new recipe!                   ")
@@ -163,16 +1022,25 @@ def view_all_recipes():
     print("                  *** View All Recipes ***                   ")
     print("=================================================================")
 
-    # Display the number of recipes found.
-    recipe_count = len(recipes)
-    recipe_word = "recipe" if recipe_count == 1 else "recipes"
-    print(f"Displaying {recipe_count} {recipe_word}\n")
+    # Ask for an optional difficulty filter; filtering uses the stored, indexed difficulty.
+    while True:
+        difficulty = input(f"Show only one difficulty ({', '.join(DIFFICULTY_LEVELS)}) or press ENTER for all: ").strip().title()
+        if not difficulty or difficulty in DIFFICULTY_LEVELS:
+            break
+        print("Invalid difficulty. Please try again.\n")
+    print()
 
-    # Loop through each recipe and display its details using a formatted string.
-    for i, recipe in enumerate(recipes, start=1):
+    # Display the recipes one page at a time, using a formatted string for each recipe.
+    def display_recipe(i, recipe):
         print(f"Recipe #{i}\n----------")
         print(format_recipe_for_search(recipe))
         print()
+
+    recipe_count = browse_recipes(session, display_recipe, difficulty=difficulty or None)
+
+    # Display the number of recipes shown.
+    recipe_word = "recipe" if recipe_count == 1 else "recipes"
+    print(f"Displayed {recipe_count} {recipe_word}")
     
     # Footer display after listing all recipes.
     print("\n--------------------------------------------------")
@@ -183,12 +1051,13 @@ def view_all_recipes():
     pause()
 
 
-def search_recipe():
-    # Retrieve all ingredients from all recipes in the database.
-    results = session.query(Recipe.ingredients).all()
+def search_recipe(session):
+    # Load the first page of ingredients that are used by at least one recipe, sorted by the database.
+    ingredient_pages = iter_ingredient_pages(session)
+    first_page = next(ingredient_pages, None)
 
     # If no recipes are found, display a message and return to the main menu.
-    if not results:
+    if first_page is None:
         print("***************************************************************")
         print("       There are no recipes in the database to search.         ")
         print("                 Please create a new recipe!                   ")
@@ -196,13 +1065,6 @@ def search_recipe():
         pause()
         return
 
-    # Initialize a set to store all unique ingredients from the database results.
-    all_ingredients = set()
-    for result in results:
-        ingredients_list = result[0].split(", ")
-        for ingredient in ingredients_list:
-            all_ingredients.add(ingredient.strip())
-
     # Print header for search function and instructions for user.
     print()
     print("=================================================================")
@@ -210,18 +1072,39 @@ def search_recipe():
     print("=================================================================")
     print("Please enter a number to see all recipes that use that ingredient\n")
 
-    # Sort and display each unique ingredient with its corresponding index.
-    sorted_ingredients = sorted(all_ingredients)
-    for i, ingredient in enumerate(sorted_ingredients):
-        print(f"{i+1}.) {ingredient.title()}")
-
-    # Prompt user to enter one or more ingredient numbers, separated by spaces.
-    print()
+    # Display the ingredients one page at a time, each with its index and number of recipes.
+    # Numbers entered by the user may refer to any ingredient shown so far.
+    shown_ingredients = []
+    page = first_page
     while True:
+        if page:
+            for ingredient in page:
+                shown_ingredients.append(ingredient.name)
+                print(f"{len(shown_ingredients)}.) {ingredient.name.title()} ({ingredient.recipe_count})")
+            more_ingredients = len(page) == PAGE_SIZE
+            page = None
+
+        # Prompt user to enter one or more ingredient numbers, separated by spaces.
+        print()
+        prompt = "Enter ingredient numbers (separate multiple numbers with spaces)"
+        if more_ingredients:
+            prompt += ", or press ENTER to see more ingredients"
+        choices = input(prompt + ": ").split()
+
+        # An empty answer loads the next page of ingredients.
+        if not choices:
+            if more_ingredients:
+                page = next(ingredient_pages, None)
+                if page is None:
+                    more_ingredients = False
+                    print("There are no more ingredients.")
+            else:
+                print("Please enter at least one number.\n")
+            continue
+
         try:
-            choices = input("Enter ingredient numbers (separate multiple numbers with spaces): ").split()
             selected_indices = [int(choice) for choice in choices]
-            if all(1 <= choice <= len(all_ingredients) for choice in selected_indices):
+            if all(1 <= choice <= len(shown_ingredients) for choice in selected_indices):
                 break
             else:
                 print("Please enter numbers within the list range.\n")
@@ -229,30 +1112,59 @@ def search_recipe():
             print("Invalid input. Please enter valid numbers.\n")
 
     # Convert user input into a list of selected ingredients.
-    search_ingredients = [sorted_ingredients[index - 1] for index in selected_indices]
+    search_ingredients = [shown_ingredients[index - 1] for index in selected_indices]
 
-    # Build a search query using the selected ingredients.
-    search_conditions = [Recipe.ingredients.ilike(f"%{ingredient}%") for ingredient in search_ingredients]
-    search_results = session.query(Recipe).filter(or_(*search_conditions)).all()
+    search_ingredients = list(dict.fromkeys(search_ingredients))
+
+    # With several ingredients, ask whether recipes need any, all, or at least some number of them.
+    min_matches = 1
+    if len(search_ingredients) > 1:
+        print()
+        while True:
+            answer = input("Match recipes with any of these ingredients (press ENTER), all of them ('all'), "
+                           f"or at least how many (1-{len(search_ingredients)})? ").strip().lower()
+            if answer == "":
+                break
+            if answer == MATCH_ALL:
+                min_matches = len(search_ingredients)
+                break
+            if answer.isdigit() and 1 <= int(answer) <= len(search_ingredients):
+                min_matches = int(answer)
+                break
+            print("Invalid choice. Please try again.\n")
 
     # Format the string of selected ingredients for display.
     if len(search_ingredients) > 1:
+        joining_word = "and" if min_matches == len(search_ingredients) else "or"
         selected_ingredients_str = ", ".join(ingredient.title() for ingredient in search_ingredients[:-1])
-        selected_ingredients_str += ", or " + search_ingredients[-1].title()
+        selected_ingredients_str += f", {joining_word} " + search_ingredients[-1].title()
+        if 1 < min_matches < len(search_ingredients):
+            selected_ingredients_str = f"at least {min_matches} of {selected_ingredients_str}"
     else:
         selected_ingredients_str = search_ingredients[0].title()
 
+    # Count the matching recipes; the search itself is ranked and fetched one page at a time.
+    service = RecipeService(session)
+    recipe_count = service.count_search_results(search_ingredients, min_matches=min_matches)
+
     # Check if there are any recipes found with the selected ingredients.
-    if search_results:
-        recipe_count = len(search_results)
+    if recipe_count:
         recipe_word = "recipe" if recipe_count == 1 else "recipes"
         print(f"\n{recipe_count} {recipe_word} found containing '{selected_ingredients_str}'\n")
         
-        # Display each found recipe with its details.
-        for i, recipe in enumerate(search_results, start=1):
-            print(f"Recipe #{i}\n----------")
-            print(format_recipe_for_search(recipe))
-            print()
+        # Display each found recipe with its details, best matches first.
+        shown = 0
+        while shown < recipe_count:
+            page = service.search_recipes(search_ingredients, min_matches=min_matches, limit=PAGE_SIZE, offset=shown)
+            if not page:
+                break
+            for recipe, matches in page:
+                shown += 1
+                print(f"Recipe #{shown} (contains {matches} of {len(search_ingredients)} selected ingredients)\n----------")
+                print(format_recipe_for_search(recipe))
+                print()
+            if shown < recipe_count and input("Press ENTER to see more recipes, or type 'q' to stop: ").strip().lower() == "q":
+                break
 
         # End of search result display with a success message.
         print()
@@ -267,12 +1179,9 @@ def search_recipe():
     pause()
 
 
-def update_recipe():
-    # Retrieve all recipes from the database.
-    recipes = session.query(Recipe).all()
-
+def update_recipe(session):
     # Check if there are any recipes in the database; if not, display a message.
-    if not recipes:
+    if not has_recipes(session):
         print("***************************************************************")
         print("       There are no recipes in the database to update.         ")
         print("                Please create a new recipe!                    ")
@@ -287,17 +1196,20 @@ def update_recipe():
     print("=================================================================")
     print("Please enter an ID number to update that recipe\n")
 
-    # Display the available recipes for update.
+    # Display the available recipes for update, one page at a time.
     print("---- Avaiable Recipes ----\n")
-    for recipe in recipes:
-        print(format_recipe_for_update(recipe))
+    browse_recipes(session, lambda i, recipe: print(format_recipe_for_update(recipe)))
     print()
 
     # Loop to get the ID of the recipe to update.
     while True:
         try:
-            recipe_id = int(input("Enter the ID of the recipe to update: "))
-            recipe_to_update = session.get(Recipe, recipe_id)
+            answer = input("Enter the ID of the recipe to update (or part of its name to search for it): ").strip()
+            if answer and not answer.isdigit():
+                print_name_matches(session, answer)
+                continue
+            recipe_id = int(answer)
+            recipe_to_update = RecipeService(session).get_recipe(recipe_id)
             if recipe_to_update:
                 break
             else:
@@ -321,7 +1233,7 @@ def update_recipe():
             while True:
                 new_value = input("\nEnter the new name (1-50 characters): ").strip()
                 if 0 < len(new_value) <= 50:
-                    recipe_to_update.name = new_value
+                    RecipeService(session).update_recipe(recipe_id, name=new_value)
                     field_updated = True
                     break
                 else:
@@ -333,9 +1245,8 @@ def update_recipe():
                 try:
                     new_value = int(input("\nEnter the new cooking time (in minutes): "))
                     if new_value > 0:
-                        recipe_to_update.cooking_time = new_value
-                        # Recalculate the difficulty after updating the cooking time.
-                        recipe_to_update.calculate_difficulty()
+                        # Update the cooking time; the service recalculates the difficulty.
+                        RecipeService(session).update_recipe(recipe_id, cooking_time=new_value)
                         field_updated = True
                         break
                     else:
@@ -348,9 +1259,8 @@ def update_recipe():
             while True:
                 new_value = input("\nEnter the new ingredients, separated by a comma: ").strip()
                 if new_value:
-                    # Update the ingredients and recalculate the difficulty.
-                    recipe_to_update.ingredients = new_value
-                    recipe_to_update.calculate_difficulty()
+                    # Update the ingredients; the service relinks them and recalculates the difficulty.
+                    RecipeService(session).update_recipe(recipe_id, ingredients=new_value)
                     field_updated = True
                     break
                 else:
@@ -374,12 +1284,9 @@ def update_recipe():
     pause()
 
 
-def delete_recipe():
-    # Retrieve all recipes from the database.
-    recipes = session.query(Recipe).all()
-
+def delete_recipe(session):
     # Check if there are any recipes in the database; if not, display a message.
-    if not recipes:
+    if not has_recipes(session):
         print("***************************************************************")
         print("        There are no recipes in the database to delete.        ")
         print("                  Please create a new recipe!                  ")
@@ -395,17 +1302,20 @@ def delete_recipe():
     print("Please enter the ID number of the recipe to remove")
     print("** Note: This can NOT be undone **\n")
 
-    # Display the available recipes for deletion.
+    # Display the available recipes for deletion, one page at a time.
     print("---- Avaiable Recipes ----\n")
-    for recipe in recipes:
-        print(format_recipe_for_update(recipe))
+    browse_recipes(session, lambda i, recipe: print(format_recipe_for_update(recipe)))
 
     # Loop to get the ID of the recipe to be deleted.
     while True:
         try:
-            recipe_id = int(input("\nEnter the ID of the recipe to delete: "))
+            answer = input("\nEnter the ID of the recipe to delete (or part of its name to search for it): ").strip()
+            if answer and not answer.isdigit():
+                print_name_matches(session, answer)
+                continue
+            recipe_id = int(answer)
             # Retrieve the recipe to be deleted from the database.
-            recipe_to_delete = session.get(Recipe, recipe_id)
+            recipe_to_delete = RecipeService(session).get_recipe(recipe_id)
 
             # Confirm deletion from the user.
             if recipe_to_delete:
@@ -426,7 +1336,7 @@ def delete_recipe():
 
     # Attempt to delete the selected recipe from the database.
     try:
-        session.delete(recipe_to_delete)
+        RecipeService(session).delete_recipe(recipe_id)
         session.commit()
         print()
         print("--------------------------------------------------")
@@ -441,6 +1351,87 @@ def delete_recipe():
     pause()
 
 
+def find_recipe_by_name(session):
+    # Header for the name search function.
+    print()
+    print("=================================================================")
+    print("                *** Find a Recipe By Name ***                    ")
+    print("=================================================================")
+    print("Please enter a recipe name, or part of it. Small typos are fine.\n")
+
+    # Loop until the user enters a non-empty search.
+    while True:
+        query = input("Recipe name: ").strip()
+        if query:
+            break
+        print("Please enter at least one character.\n")
+
+    # Search the full-text index (with the trigram fallback) and display the matching recipes.
+    recipes = RecipeService(session).search_by_name(query)
+    if recipes:
+        recipe_word = "recipe" if len(recipes) == 1 else "recipes"
+        print(f"\n{len(recipes)} {recipe_word} found matching '{query}'\n")
+        for recipe in recipes:
+            print(format_recipe_for_update(recipe))
+    else:
+        print(f"\nNo recipes found matching '{query}'\n")
+
+    # Pause the execution and wait for the user to press enter.
+    pause()
+
+
+def print_name_matches(session, query):
+    # Display the recipes whose name matches the query, so the user can find the ID they are looking for.
+    recipes = RecipeService(session).search_by_name(query)
+    if not recipes:
+        print(f"No recipes found matching '{query}'. Please try again.\n")
+        return
+    print()
+    for recipe in recipes:
+        print(format_recipe_for_update(recipe))
+
+
+def show_query_stats(session):
+    # Show Query Stats: Prints the statements that took the most time, the flagged ones and the cache counters.
+    stats = query_metrics.snapshot(limit=5)
+    print()
+    print("==================================================")
+    print("              *** Query Statistics ***            ")
+    print("==================================================")
+    print(f"{stats['statements']} statements, {stats['total_ms']:.1f} ms in total\n")
+
+    print("Most time consuming statements:")
+    for statement in stats["top"]:
+        flags = [flag for flag, is_set in (("FULL SCAN", statement["full_scan"]), ("N+1", statement["n_plus_one"])) if is_set]
+        print(f"- {statement['count']}x, {statement['mean_ms']:.2f} ms on average, {statement['max_ms']:.2f} ms max"
+              f"{' [' + ', '.join(flags) + ']' if flags else ''}")
+        print(f"  {statement['statement'][:150]}")
+    print()
+    print(f"Statements with full table scans: {len(stats['full_scans'])}")
+    print(f"Statements with N+1 patterns: {len(stats['n_plus_one'])}")
+    print(f"Slow queries (>= {stats['slow_query_ms']:g} ms): {len(stats['slow_queries'])}")
+    for query in stats["slow_queries"][-5:]:
+        print(f"- {query['duration_ms']:.1f} ms: {query['statement'][:150]}")
+
+    cache = search_cache.stats()
+    print()
+    print(f"Search cache: {cache['entries']} searches cached, {cache['hits']} hits, {cache['misses']} misses "
+          f"(hit ratio {cache['hit_ratio']:.0%})\n")
+    pause()
+
+
+# Menu Actions: Maps each main menu choice to the function that handles it.
+MENU_ACTIONS = {
+    "1": create_recipe,
+    "2": view_all_recipes,
+    "3": search_recipe,
+    "4": update_recipe,
+    "5": delete_recipe,
+    "6": find_recipe_by_name,
+    "7": show_query_stats,
+}
+
+
 def main_menu():
     # Initialize the choice variable.
     choice = ""
@@ -459,7 +1450,9 @@ def main_menu():
         print("2. View all recipes")
         print("3. Search for a recipe by ingredient")
         print("4. Update an existing recipe")
-        print("5. Delete a recipe\n")
+        print("5. Delete a recipe")
+        print("6. Find a recipe by name")
+        print("7. Show query statistics\n")
         print("Type 'quit' to exit the program\n")
         
         # while True:
@@ -467,16 +1460,10 @@ def main_menu():
         choice = input("Your choice: ").strip().lower()
 
         # Execute the appropriate function based on the user's choice.
-        if choice == "1":
-            create_recipe()
-        elif choice == "2":
-            view_all_recipes()
-        elif choice == "3":
-            search_recipe()
-        elif choice == "4":
-            update_recipe()
-        elif choice == "5":
-            delete_recipe()
+        if choice in MENU_ACTIONS:
+            # Each action runs in its own session, which is closed again before the menu is shown.
+            with session_scope() as session:
+                MENU_ACTIONS[choice](session)
         elif choice == "quit":
             # Display a goodbye message when the user decides to quit the application.
             print("=============================================")
@@ -487,16 +1474,33 @@ def main_menu():
         else:
             # Handle invalid input and prompt the user to try again.
             print("---------------------------------------------------")
-            print("Invalid choice! Please enter 1, 2, 3, 4, 5, or 'quit'.")
+            print("Invalid choice! Please enter 1, 2, 3, 4, 5, 6, 7, or 'quit'.")
             print("---------------------------------------------------\n")
             
             # Pause for user acknowledgement before showing the menu again.
             pause()
 
-    session.close()
     engine.dispose()
 
 
+def browse_recipes(session, display_recipe, page_size=PAGE_SIZE, difficulty=None):
+    # Browse Recipes: Displays recipes page by page and lets the user stop at any page.
+    # Returns the number of recipes displayed.
+    shown = 0
+    for page in iter_recipe_pages(session, page_size, difficulty=difficulty):
+        for recipe in page:
+            shown += 1
+            display_recipe(shown, recipe)
+
+        # A short page is the last one; otherwise ask whether to load the next page.
+        if len(page) < page_size:
+            break
+        if input("Press ENTER to see more recipes, or type 'q' to stop browsing: ").strip().lower() == "q":
+            print()
+            break
+    return shown
+
+
 def format_recipe_for_search(recipe):
     # Format the recipe's ingredients for display: each ingredient is listed on a new line with a dash.
     formatted_ingredients = "\n  ".join(f"- {ingredient.title()}" for ingredient in recipe.ingredients.split(", "))
@@ -530,6 +1534,8 @@ def pause():
 
 
 if __name__ == "__main__":
-    # This is the entry point of the program. If this script is executed, run the main menu function.
+    # This is the entry point of the program. If this script is executed, prepare the database
+    # and then run the main menu function.
+    init_db()
     main_menu()
     
\ No newline at end of file
@@ -0,0 +1,301 @@
+import argparse
+import contextlib
+import json
+import os
+import pickle
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select, text
+
+# Database URL: recipe_app creates its engine when it is imported, and the default MySQL engine needs a MySQL
+# driver. bench_database() points the app at each benchmark database, so an in-memory SQLite engine is enough here.
+os.environ.setdefault("RECIPE_DATABASE_URL", "sqlite://")
+
+import recipe_app  # noqa: E402
+from recipe_app import (  # noqa: E402
+    RecipeService, Base, Recipe, configure_database, init_db, session_scope, iter_recipe_pages,
+    classify_difficulties, search_cache, MATCH_ALL)
+from recipe_import import import_batch  # noqa: E402
+
+# Other Exercises: The benchmark also times the file based (1.4) and in-memory (1.5) versions of the app.
+EXERCISES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(EXERCISES_DIR, "Exercise-1.4"))
+sys.path.append(os.path.join(EXERCISES_DIR, "Exercise-1.5"))
+
+from recipe_columns import RecipeColumns, write_columns  # noqa: E402
+from recipe_store import RecipeStore  # noqa: E402
+import recipe_oop  # noqa: E402
+
+# Defaults: Size and shape of the synthetic catalog, and how often each measurement is repeated.
+DEFAULT_RECIPES = 10000
+DEFAULT_VOCABULARY = 500
+DEFAULT_SKEW = 1.1
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 5
+
+# Insert Count: Recipes created one at a time through RecipeService.create_recipe(), like the menu does;
+# the rest of the catalog is loaded with the bulk importer.
+INSERT_COUNT = 200
+
+# Recipe Shape: Ingredients per recipe and cooking time range of the generated recipes.
+MIN_INGREDIENTS = 2
+MAX_INGREDIENTS = 8
+MAX_COOKING_TIME = 120
+
+
+def generate_recipes(count, vocabulary=DEFAULT_VOCABULARY, skew=DEFAULT_SKEW, seed=DEFAULT_SEED):
+    # Generate Recipes: Deterministic synthetic recipes (the same arguments always give the same recipes).
+    # Ingredient popularity follows a Zipf distribution: ingredient k is picked with weight 1 / k ** skew,
+    # so a few ingredients appear in most recipes and most ingredients are rare, as in real catalogs.
+    rng = random.Random(seed)
+    ingredients = [f"ingredient {k:05d}" for k in range(1, vocabulary + 1)]
+    cum_weights = []
+    total = 0.0
+    for k in range(1, vocabulary + 1):
+        total += 1 / k ** skew
+        cum_weights.append(total)
+
+    recipes = []
+    for n in range(count):
+        wanted = min(rng.randint(MIN_INGREDIENTS, MAX_INGREDIENTS), vocabulary)
+        chosen = {}
+        while len(chosen) < wanted:
+            chosen[rng.choices(ingredients, cum_weights=cum_weights)[0]] = None
+        recipes.append({"name": f"Recipe {n + 1}", "cooking_time": rng.randint(1, MAX_COOKING_TIME),
+                        "ingredients": list(chosen)})
+    return recipes, ingredients
+
+
+def search_terms(ingredients):
+    # Search Terms: A popular, a middling and a rare ingredient of the Zipf vocabulary.
+    return {"popular": ingredients[0], "median": ingredients[len(ingredients) // 2], "rare": ingredients[-1]}
+
+
+def measure(action, repeat):
+    # Measure: Runs action repeat times and summarizes the wall clock times in milliseconds.
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"runs": repeat, "min_ms": min(times), "median_ms": statistics.median(times),
+            "mean_ms": statistics.fmean(times), "max_ms": max(times)}
+
+
+def measure_once(action, operations):
+    # Measure Once: Times one run of action that performs the given number of operations.
+    start = time.perf_counter()
+    action()
+    elapsed = (time.perf_counter() - start) * 1000
+    return {"operations": operations, "total_ms": elapsed, "per_operation_ms": elapsed / operations}
+
+
+def bench_database(url, recipes, ingredients, repeat):
+    # Bench Database: Loads the catalog into an empty database and times the recipe_app code paths on it.
+    configure_database(url)
+    Base.metadata.drop_all(recipe_app.engine)
+    init_db()
+    results = {"backend": recipe_app.engine.url.get_backend_name()}
+
+    # Create Recipe: One RecipeService.create_recipe() and commit per recipe, as in the menu.
+    single = recipes[:INSERT_COUNT]
+
+    def create_recipes():
+        for recipe in single:
+            with session_scope() as session:
+                RecipeService(session).create_recipe(recipe["name"], recipe["cooking_time"],
+                                                      ", ".join(recipe["ingredients"]))
+
+    results["create_recipe"] = measure_once(create_recipes, len(single))
+
+    # Bulk Import: The rest of the catalog through the importer's executemany batches.
+    rest = [(recipe["name"], recipe["cooking_time"], recipe["ingredients"]) for recipe in recipes[INSERT_COUNT:]]
+
+    def import_rest():
+        with session_scope() as session:
+            for start in range(0, len(rest), 1000):
+                import_batch(session, rest[start:start + 1000])
+
+    if rest:
+        results["bulk_import"] = measure_once(import_rest, len(rest))
+
+    # View All Recipes: Every page of the keyset pagination used by view_all_recipes().
+    def view_all():
+        with session_scope() as session:
+            for page in iter_recipe_pages(session):
+                pass
+
+    results["view_all_recipes"] = measure(view_all, repeat)
+
+    # Search: The LIKE scan of the Exercise-1.6 search_recipe(), against the indexed search of RecipeService,
+    # without the search cache (cold) and with it (warm).
+    for label, ingredient in search_terms(ingredients).items():
+        def like_search():
+            with session_scope() as session:
+                session.execute(select(Recipe).where(Recipe.ingredients.like(f"%{ingredient}%"))).all()
+
+        def indexed_search():
+            search_cache.clear()
+            with session_scope() as session:
+                RecipeService(session).search_recipes([ingredient])
+
+        def cached_search():
+            with session_scope() as session:
+                RecipeService(session).search_recipes([ingredient])
+
+        results[f"like_search_{label}"] = measure(like_search, repeat)
+        results[f"indexed_search_{label}"] = measure(indexed_search, repeat)
+        cached_search()
+        results[f"cached_search_{label}"] = measure(cached_search, repeat)
+
+    all_terms = list(search_terms(ingredients).values())[:2]
+
+    def match_all_search():
+        search_cache.clear()
+        with session_scope() as session:
+            RecipeService(session).search_recipes(all_terms, MATCH_ALL)
+
+    results["indexed_search_all_of_two"] = measure(match_all_search, repeat)
+
+    def name_search():
+        with session_scope() as session:
+            RecipeService(session).search_by_name(recipes[len(recipes) // 2]["name"])
+
+    results["name_search"] = measure(name_search, repeat)
+
+    with session_scope() as session:
+        results["recipe_count"] = session.execute(text("SELECT COUNT(*) FROM final_recipes")).scalar()
+    return results
+
+
+def bench_files(recipes, ingredients, repeat, directory):
+    # Bench Files: The Exercise-1.4 data files; the whole-file pickle read by recipe_search.py,
+    # the append-only RecipeStore and the memory-mapped column file.
+    results = {}
+    terms = search_terms(ingredients)
+    file_recipes = [dict(recipe, cooking_time=str(recipe["cooking_time"]), difficulty=difficulty)
+                    for recipe, difficulty in zip(recipes, recipe_difficulties(recipes))]
+
+    pickle_path = os.path.join(directory, "recipes.bin")
+    with open(pickle_path, "wb") as file:
+        pickle.dump({"recipes_list": file_recipes, "all_ingredients": ingredients}, file)
+
+    def pickle_load():
+        with open(pickle_path, "rb") as file:
+            return pickle.load(file)
+
+    def pickle_search():
+        data = pickle_load()
+        return [item for item in data["recipes_list"] if terms["popular"] in item["ingredients"]]
+
+    results["pickle_load"] = measure(pickle_load, repeat)
+    results["pickle_load_and_search"] = measure(pickle_search, repeat)
+
+    store_path = os.path.join(directory, "recipes")
+    with RecipeStore(store_path) as store:
+        results["store_add"] = measure_once(lambda: [store.add(recipe) for recipe in file_recipes], len(file_recipes))
+    for label, ingredient in terms.items():
+        def store_search():
+            with RecipeStore(store_path) as store:
+                store.find_by_ingredient(ingredient)
+
+        results[f"store_search_{label}"] = measure(store_search, repeat)
+
+    columns_path = os.path.join(directory, "recipes.col")
+    results["columns_write"] = measure_once(lambda: write_columns(columns_path, file_recipes), len(file_recipes))
+    for label, ingredient in terms.items():
+        def columns_search():
+            with RecipeColumns(columns_path) as columns:
+                len(columns.recipes_with_ingredient(ingredient))
+
+        results[f"columns_search_{label}"] = measure(columns_search, repeat)
+    return results
+
+
+def bench_objects(recipes, ingredients, repeat):
+    # Bench Objects: recipe_search() of Exercise-1.5 over a list of Recipe objects and over a RecipeCatalog.
+    results = {}
+    objects = [recipe_oop.Recipe(recipe["name"], list(recipe["ingredients"]), recipe["cooking_time"])
+               for recipe in recipes]
+    catalog = recipe_oop.RecipeCatalog(objects)
+    results["catalog_build"] = measure_once(lambda: recipe_oop.RecipeCatalog(objects), len(objects))
+
+    # recipe_search() prints every match; the output is discarded so only the search itself is timed.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for label, ingredient in search_terms(ingredients).items():
+            results[f"list_search_{label}"] = measure(lambda: recipe_oop.recipe_search(objects, ingredient), repeat)
+            results[f"catalog_search_{label}"] = measure(lambda: recipe_oop.recipe_search(catalog, ingredient), repeat)
+    return results
+
+
+def recipe_difficulties(recipes):
+    # Recipe Difficulties: Grades the generated recipes with the batch classifier, in the lower case of Exercise-1.4.
+    codes = classify_difficulties([recipe["cooking_time"] for recipe in recipes],
+                                  [len(recipe["ingredients"]) for recipe in recipes])
+    return [recipe_app.DIFFICULTY_LEVELS[code].lower() for code in codes]
+
+
+def bench_difficulty(recipes, repeat):
+    cooking_times = [recipe["cooking_time"] for recipe in recipes]
+    ingredient_counts = [len(recipe["ingredients"]) for recipe in recipes]
+    return {"classify_difficulties": measure(lambda: classify_difficulties(cooking_times, ingredient_counts), repeat),
+            "numpy": recipe_app.numpy is not None}
+
+
+def run(args):
+    # Run: Generates the catalog once and benchmarks every code path on it. Returns the JSON report.
+    recipes, ingredients = generate_recipes(args.recipes, args.vocabulary, args.skew, args.seed)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"recipes": args.recipes, "vocabulary": args.vocabulary, "skew": args.skew,
+                   "seed": args.seed, "repeat": args.repeat},
+        "results": {},
+    }
+    results = report["results"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        results["difficulty"] = bench_difficulty(recipes, args.repeat)
+        results["objects"] = bench_objects(recipes, ingredients, args.repeat)
+        results["files"] = bench_files(recipes, ingredients, args.repeat, directory)
+        results["sqlite"] = bench_database(f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                                           recipes, ingredients, args.repeat)
+        if args.mysql_url:
+            results["mysql"] = bench_database(args.mysql_url, recipes, ingredients, args.repeat)
+        recipe_app.engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recipe app on a synthetic catalog and write the "
+                                                 "results as JSON.")
+    parser.add_argument("--recipes", type=int, default=DEFAULT_RECIPES, help="number of recipes to generate")
+    parser.add_argument("--vocabulary", type=int, default=DEFAULT_VOCABULARY, help="number of distinct ingredients")
+    parser.add_argument("--skew", type=float, default=DEFAULT_SKEW, help="Zipf exponent of ingredient popularity")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed of the generator")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per timed measurement")
+    parser.add_argument("--mysql-url", help="also benchmark this MySQL database; its recipe tables are dropped first, "
+                                            "so use a scratch database")
+    parser.add_argument("--output", help="file to write the JSON report to (default: standard output)")
+    args = parser.parse_args()
+
+    if args.recipes < 1 or args.vocabulary < 1 or args.repeat < 1:
+        parser.error("--recipes, --vocabulary and --repeat must be positive numbers")
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import csv
+import json
+import os
+import pickle
+from collections import Counter
+
+from sqlalchemy import bindparam, insert, select, text
+
+from recipe_app import (configure_database, init_db, session_scope, Recipe, Ingredient, recipe_ingredients,
+                        recipe_name_trigrams, calculate_difficulties, mark_ingredients_changed, name_trigrams,
+                        normalize_ingredient, stream_recipes, DIFFICULTY_RULES_VERSION)
+
+# Default Batch Size: Number of recipes inserted (and committed) per round trip.
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_csv(path):
+    # Read CSV: Expects a header row with name, cooking_time and ingredients (comma separated) columns.
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            yield row
+
+
+def read_jsonl(path):
+    # Read JSON Lines: One recipe object per line; ingredients may be a list or a comma separated string.
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_pickle(path):
+    # Read Pickle: The format written by Exercise-1.4/recipe_input.py ({"recipes_list": [...], ...}).
+    with open(path, "rb") as file:
+        data = pickle.load(file)
+    yield from data["recipes_list"]
+
+
+# Readers: Maps a format name to the function that streams its rows.
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "pickle": read_pickle}
+
+# Extensions: Used to guess the format when it is not given on the command line.
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".bin": "pickle", ".pkl": "pickle", ".pickle": "pickle"}
+
+
+def clean_row(row):
+    # Clean Row: Validates one input row with the same rules as create_recipe().
+    # Returns (name, cooking_time, ingredients) or None if the row is not a valid recipe.
+    name = str(row.get("name") or "").strip()
+    try:
+        cooking_time = int(row.get("cooking_time"))
+    except (TypeError, ValueError):
+        return None
+
+    ingredients = row.get("ingredients") or []
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(",")
+    ingredients = [" ".join(str(ingredient).split()) for ingredient in ingredients]
+    ingredients = [ingredient for ingredient in ingredients if ingredient]
+
+    if not 0 < len(name) <= 50 or cooking_time <= 0 or not ingredients:
+        return None
+    return name, cooking_time, ingredients
+
+
+def batched(rows, batch_size):
+    # Batched: Groups a stream of rows into lists of at most batch_size rows.
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingredient_ids(session, names):
+    # Ingredient IDs: Resolves names to ids with one IN query, inserting the missing names in bulk.
+    ids = dict(session.execute(select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(names))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        session.execute(insert(Ingredient), [{"name": name} for name in missing])
+        ids.update(session.execute(select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(missing))).all())
+    return ids
+
+
+def insert_recipes(session, mappings):
+    # Insert Recipes: Inserts a batch of recipe rows and returns their ids in order, with one INSERT round trip
+    # on every backend the app supports.
+    dialect = session.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        # RETURNING (e.g. SQLite): One batched INSERT that returns the new ids in parameter order.
+        return list(session.scalars(insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True), mappings))
+    if dialect.name == "mysql":
+        # MySQL has no RETURNING, so the batch is one multi-row INSERT. InnoDB gives the rows of a single INSERT
+        # with a known row count consecutive ids (in every innodb_autoinc_lock_mode), so they follow from the
+        # first id, which MySQL reports as lastrowid, and the server's auto-increment step.
+        result = session.execute(insert(Recipe.__table__).values(mappings))
+        step = session.execute(text("SELECT @@auto_increment_increment")).scalar()
+        return list(range(result.lastrowid, result.lastrowid + step * len(mappings), step))
+    session.bulk_insert_mappings(Recipe, mappings, return_defaults=True)
+    return [mapping["id"] for mapping in mappings]
+
+
+def import_batch(session, batch):
+    # Import Batch: Inserts a batch of cleaned rows with executemany-style statements and one commit.
+    names = [[normalize_ingredient(ingredient) for ingredient in ingredients] for _, _, ingredients in batch]
+    names = [list(dict.fromkeys(recipe_names)) for recipe_names in names]
+    difficulties = calculate_difficulties([cooking_time for _, cooking_time, _ in batch],
+                                          [len(recipe_names) for recipe_names in names])
+
+    mappings = [{"name": name, "ingredients": ", ".join(ingredients), "cooking_time": cooking_time,
+                 "difficulty": difficulty, "difficulty_version": DIFFICULTY_RULES_VERSION, "ingredient_count": len(recipe_names)}
+                for (name, cooking_time, ingredients), recipe_names, difficulty in zip(batch, names, difficulties)]
+    recipe_ids = insert_recipes(session, mappings)
+
+    ids = ingredient_ids(session, list(dict.fromkeys(name for recipe_names in names for name in recipe_names)))
+    mark_ingredients_changed(session, ids)
+    links = [{"recipe_id": recipe_id, "ingredient_id": ids[name]}
+             for recipe_id, recipe_names in zip(recipe_ids, names) for name in recipe_names]
+    session.execute(recipe_ingredients.insert(), links)
+    session.execute(recipe_name_trigrams.insert(),
+                    [{"trigram": trigram, "recipe_id": recipe_id}
+                     for recipe_id, mapping in zip(recipe_ids, mappings) for trigram in name_trigrams(mapping["name"])])
+
+    # Move the ingredient recipe counts with one executemany UPDATE per batch.
+    added = Counter(link["ingredient_id"] for link in links)
+    ingredients_table = Ingredient.__table__
+    session.execute(ingredients_table.update()
+                    .where(ingredients_table.c.id == bindparam("ingredient_id"))
+                    .values(recipe_count=ingredients_table.c.recipe_count + bindparam("added")),
+                    [{"ingredient_id": ingredient_id, "added": count} for ingredient_id, count in added.items()])
+    session.commit()
+
+
+def import_recipes(path, file_format=None, batch_size=DEFAULT_BATCH_SIZE):
+    # Import Recipes: Streams the file through import_batch(); only one batch is held in memory at a time.
+    # Returns the number of imported and skipped rows.
+    if file_format is None:
+        file_format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if file_format not in READERS:
+        raise ValueError(f"Unknown file format for '{path}'. Use one of: {', '.join(READERS)}")
+
+    imported = skipped = 0
+    with session_scope() as session:
+        for rows in batched(READERS[file_format](path), batch_size):
+            batch = [recipe for recipe in map(clean_row, rows) if recipe is not None]
+            skipped += len(rows) - len(batch)
+            if batch:
+                import_batch(session, batch)
+                imported += len(batch)
+    return imported, skipped
+
+
+def export_recipes(path, batch_size=DEFAULT_BATCH_SIZE):
+    # Export Recipes: Writes every recipe to a JSON Lines file that import_recipes() reads back. The recipes are
+    # streamed with stream_recipes(), so only batch_size rows are held in memory at a time.
+    # Returns the number of exported recipes.
+    exported = 0
+    with session_scope() as session, open(path, "w", encoding="utf-8") as file:
+        for recipe in stream_recipes(session, batch_size):
+            file.write(json.dumps({"name": recipe.name,
+                                   "cooking_time": recipe.cooking_time,
+                                   "ingredients": recipe.return_ingredients_as_list()}) + "\n")
+            exported += 1
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import recipes into the recipe app database, or export them.")
+    parser.add_argument("path", help="CSV, JSON Lines or Exercise-1.4 pickle file to import (with --export: the "
+                                     "JSON Lines file to write)")
+    parser.add_argument("--format", choices=sorted(READERS), help="file format (guessed from the extension by default)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="recipes per insert batch and commit")
+    parser.add_argument("--database-url", help="database to import into (default: RECIPE_DATABASE_URL or the MySQL database)")
+    parser.add_argument("--export", action="store_true", help="export the recipes of the database to path instead")
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be a positive number")
+
+    if args.database_url:
+        configure_database(args.database_url)
+    init_db()
+
+    if args.export:
+        try:
+            exported = export_recipes(args.path, args.batch_size)
+        except OSError as err:
+            parser.exit(1, f"Export failed: {err}\n")
+        print(f"Exported {exported} recipes.")
+        return
+
+    try:
+        imported, skipped = import_recipes(args.path, args.format, args.batch_size)
+    except (OSError, ValueError) as err:
+        parser.exit(1, f"Import failed: {err}\n")
+
+    print(f"Imported {imported} recipes ({skipped} invalid rows skipped).")
+
+
+if __name__ == "__main__":
+    main()
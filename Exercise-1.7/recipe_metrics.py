@@ -0,0 +1,214 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Slow Query Threshold: Statements taking at least this many milliseconds are written to the slow query log.
+SLOW_QUERY_MS = float(os.environ.get("RECIPE_SLOW_QUERY_MS", 100))
+
+# N+1 Threshold: A statement run this many times while one connection is checked out (one operation) is
+# flagged as a likely N+1 pattern, e.g. a lazy load per row instead of one query for all rows.
+N_PLUS_ONE_THRESHOLD = 10
+
+# Latency Buckets: Upper bounds in milliseconds of the latency histogram of every statement.
+LATENCY_BUCKETS_MS = (0.5, 1, 5, 10, 50, 100, 500, 1000, float("inf"))
+
+# Recent Slow Queries: Number of slow queries kept in memory for the stats report.
+RECENT_SLOW_QUERIES = 20
+
+# Slow Query Log: Written through logging; see enable_slow_query_log() to send it to a file.
+slow_query_log = logging.getLogger("recipe_app.slow_queries")
+slow_query_log.addHandler(logging.NullHandler())
+
+# Placeholder Lists: Expanded IN (...) lists, so "IN (?, ?)" and "IN (?, ?, ?)" count as one statement.
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+
+
+def statement_key(statement):
+    # Statement Key: The statement with whitespace collapsed and IN lists shortened, to group executions by.
+    return PLACEHOLDER_LIST.sub("(...)", " ".join(statement.split()))
+
+
+class StatementStats:
+    # Statement Stats: Counters of one statement (key).
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "histogram", "full_scan", "n_plus_one", "plan_sample")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+        self.full_scan = None
+        self.n_plus_one = 0
+        # Plan Sample: (engine, statement, parameters) of the first execution, until its plan has been checked.
+        self.plan_sample = None
+
+    def to_dict(self, statement):
+        return {"statement": statement, "count": self.count, "total_ms": round(self.total_ms, 3),
+                "mean_ms": round(self.total_ms / self.count, 3), "max_ms": round(self.max_ms, 3), "rows": self.rows,
+                "histogram": {f"<={bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram) if count},
+                "full_scan": self.full_scan, "n_plus_one": self.n_plus_one}
+
+
+class QueryMetrics:
+    # Query Metrics: Collects statement latency, row counts, N+1 and full scan flags for every engine of the
+    # process through SQLAlchemy's before/after_cursor_execute events.
+    #   rows       - rows reported by the driver (affected rows; returned rows where the driver reports them)
+    #   full_scan  - the statement's query plan reads a whole table; checked once per statement with EXPLAIN,
+    #                when a snapshot is taken, on a connection of its own (never on the one running the statement,
+    #                where it would add a round trip and discard the pending rows of a streamed result)
+    #   n_plus_one - how often the statement crossed N_PLUS_ONE_THRESHOLD executions within one operation
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self.statements = {}
+        self.slow_queries = deque(maxlen=RECENT_SLOW_QUERIES)
+        self.lock = threading.Lock()
+        self.installed = False
+
+    def install(self):
+        # Install: Listens on the Engine and Pool classes, so engines created later (configure_database(),
+        # the API's async engine) are measured too.
+        if not self.installed:
+            event.listen(Engine, "before_cursor_execute", self.before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", self.after_cursor_execute)
+            event.listen(Engine, "handle_error", self.handle_error)
+            event.listen(Pool, "checkin", self.checkin)
+            self.installed = True
+
+    def reset(self):
+        with self.lock:
+            self.statements.clear()
+            self.slow_queries.clear()
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_times"].pop()) * 1000
+        key = statement_key(statement)
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else 0
+
+        # Executions per statement since the connection was checked out, for the N+1 check.
+        executions = conn.info.setdefault("statement_executions", {})
+        executions[key] = executions.get(key, 0) + 1
+
+        with self.lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats()
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.rows += rows
+            stats.histogram[next(i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound)] += 1
+            if not executemany and executions[key] == N_PLUS_ONE_THRESHOLD:
+                stats.n_plus_one += 1
+            if stats.count == 1 and not executemany:
+                stats.plan_sample = (conn.engine, statement, parameters)
+
+        if elapsed_ms >= self.slow_query_ms:
+            self.log_slow_query(statement, parameters, elapsed_ms, rows)
+
+    def handle_error(self, exception_context):
+        # Handle Error: A failed statement never reaches after_cursor_execute, so its start time is dropped here;
+        # otherwise the next statement on the connection would be timed from it.
+        conn = exception_context.connection
+        if conn is not None and exception_context.execution_context is not None:
+            start_times = conn.info.get("query_start_times")
+            if start_times:
+                start_times.pop()
+
+    def checkin(self, dbapi_connection, connection_record):
+        # Checkin: The connection is back in the pool, so the next operation starts counting from zero.
+        connection_record.info.pop("statement_executions", None)
+
+    def is_full_scan(self, engine, statement, parameters):
+        # Is Full Scan: Asks the database for the statement's plan on a DBAPI connection checked out for it alone,
+        # so no engine events fire for the EXPLAIN. SQLite reports "SCAN <table>" for a table scan, MySQL reports
+        # access type ALL.
+        if statement.lstrip().split(None, 1)[0].upper() not in ("SELECT", "UPDATE", "DELETE"):
+            return False
+        backend = engine.dialect.name
+        if backend == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif backend == "mysql":
+            prefix = "EXPLAIN "
+        else:
+            return None
+        try:
+            dbapi_connection = engine.raw_connection()
+            try:
+                explain_cursor = dbapi_connection.cursor()
+                try:
+                    explain_cursor.execute(prefix + statement, parameters)
+                    plan = explain_cursor.fetchall()
+                    columns = [column[0].lower() for column in explain_cursor.description]
+                finally:
+                    explain_cursor.close()
+            finally:
+                dbapi_connection.close()
+        except Exception:
+            return None
+
+        if backend == "sqlite":
+            details = [row[columns.index("detail")] for row in plan]
+            return any(re.match(r"SCAN (TABLE )?\w+$", detail) for detail in details)
+        return any(row[columns.index("type")] == "ALL" for row in plan)
+
+    def check_plans(self):
+        # Check Plans: Runs the pending plan checks, one EXPLAIN per statement seen since the last snapshot.
+        with self.lock:
+            pending = [stats for stats in self.statements.values() if stats.plan_sample is not None]
+            samples = [stats.plan_sample for stats in pending]
+            for stats in pending:
+                stats.plan_sample = None
+        for stats, (engine, statement, parameters) in zip(pending, samples):
+            full_scan = self.is_full_scan(engine, statement, parameters)
+            with self.lock:
+                stats.full_scan = full_scan
+
+    def log_slow_query(self, statement, parameters, elapsed_ms, rows):
+        entry = {"statement": " ".join(statement.split()), "parameters": repr(parameters)[:200],
+                 "duration_ms": round(elapsed_ms, 3), "rows": rows}
+        with self.lock:
+            self.slow_queries.append(entry)
+        slow_query_log.warning("Slow query (%.1f ms, %d rows): %s | parameters: %s",
+                               elapsed_ms, rows, entry["statement"], entry["parameters"])
+
+    def snapshot(self, limit=20):
+        # Snapshot: The statements that took the most time in total, plus the flagged and slow ones.
+        # Called from the API through run_sync(), so the plan checks of its async engine run in a greenlet.
+        self.check_plans()
+        with self.lock:
+            items = sorted(self.statements.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                "statements": sum(stats.count for _, stats in items),
+                "total_ms": round(sum(stats.total_ms for _, stats in items), 3),
+                "slow_query_ms": self.slow_query_ms,
+                "top": [stats.to_dict(key) for key, stats in items[:limit]],
+                "full_scans": [key for key, stats in items if stats.full_scan],
+                "n_plus_one": [key for key, stats in items if stats.n_plus_one],
+                "slow_queries": list(self.slow_queries),
+            }
+
+
+query_metrics = QueryMetrics()
+
+
+def enable_slow_query_log(path, slow_query_ms=None):
+    # Enable Slow Query Log: Appends slow queries to a file, optionally with a new threshold.
+    if slow_query_ms is not None:
+        query_metrics.slow_query_ms = slow_query_ms
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_log.addHandler(handler)
+    slow_query_log.setLevel(logging.WARNING)
+    return handler
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+# Database URL: recipe_app creates its engine when it is imported; the rules tested here never touch it.
+os.environ.setdefault("RECIPE_DATABASE_URL", "sqlite://")
+
+import recipe_app  # noqa: E402
+from recipe_app import (  # noqa: E402
+    DIFFICULTY_LEVELS, LONG_COOKING_TIME, MANY_INGREDIENTS, Recipe, calculate_difficulties, classify_difficulties)
+
+
+def graded_recipes():
+    # Graded Recipes: Every combination around the rule thresholds, graded by Recipe.calculate_difficulty().
+    cooking_times, ingredient_counts, expected = [], [], []
+    for cooking_time in range(1, LONG_COOKING_TIME * 2 + 1):
+        for num_ingredients in range(1, MANY_INGREDIENTS * 2 + 1):
+            recipe = Recipe(name="Check", cooking_time=cooking_time,
+                            ingredients=", ".join(f"ingredient {i}" for i in range(num_ingredients)))
+            recipe.calculate_difficulty()
+            cooking_times.append(cooking_time)
+            ingredient_counts.append(num_ingredients)
+            expected.append(recipe.difficulty)
+    return cooking_times, ingredient_counts, expected
+
+
+@pytest.fixture(params=["numpy", "bytes"])
+def batch_backend(request, monkeypatch):
+    # Batch Backend: Runs a test once with the NumPy branch of the batch functions and once with the bytes branch.
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        assert recipe_app.numpy is not None
+    else:
+        monkeypatch.setattr(recipe_app, "numpy", None)
+    return request.param
+
+
+def test_classify_difficulties_follows_the_rules(batch_backend):
+    cooking_times, ingredient_counts, expected = graded_recipes()
+    codes = classify_difficulties(cooking_times, ingredient_counts)
+    if batch_backend == "bytes":
+        assert isinstance(codes, bytes)
+    assert [DIFFICULTY_LEVELS[code] for code in codes] == expected
+
+
+def test_calculate_difficulties_follows_the_rules(batch_backend):
+    cooking_times, ingredient_counts, expected = graded_recipes()
+    assert calculate_difficulties(cooking_times, ingredient_counts) == expected
@@ -18,9 +18,10 @@ from pip._internal.cli.base_command import Command
 from pip._internal.cli.command_context import CommandContextMixIn
 from pip._internal.exceptions import CommandError, PreviousBuildDirError
 from pip._internal.index.collector import LinkCollector
-from pip._internal.index.package_finder import PackageFinder
+from pip._internal.index.package_finder import INDEX_LOOKUP_WORKERS, PackageFinder
 from pip._internal.models.selection_prefs import SelectionPreferences
 from pip._internal.models.target_python import TargetPython
+from pip._internal.network.download import PARALLEL_DOWNLOAD_WORKERS
 from pip._internal.network.session import PipSession
 from pip._internal.operations.build.build_tracker import BuildTracker
 from pip._internal.operations.prepare import RequirementPreparer
@@ -308,6 +309,11 @@ class RequirementCommand(IndexGroupCommand):
                     "fast-deps has no effect when used with the legacy resolver."
                 )
 
+        if "parallel-downloads" in options.features_enabled:
+            download_workers = PARALLEL_DOWNLOAD_WORKERS
+        else:
+            download_workers = 1
+
         return RequirementPreparer(
             build_dir=temp_build_dir_path,
             src_dir=options.src_dir,
@@ -323,6 +329,7 @@ class RequirementCommand(IndexGroupCommand):
             lazy_wheel=lazy_wheel,
             verbosity=verbosity,
             legacy_resolver=legacy_resolver,
+            download_workers=download_workers,
         )
 
     @classmethod
@@ -349,6 +356,10 @@ class RequirementCommand(IndexGroupCommand):
             use_pep517=use_pep517,
         )
         resolver_variant = cls.determine_resolver_variant(options)
+        if "prefetch-index-pages" in options.features_enabled:
+            prefetch_workers = INDEX_LOOKUP_WORKERS
+        else:
+            prefetch_workers = 1
         # The long import name and duplicated invocation is needed to convince
         # Mypy into correctly typechecking. Otherwise it would complain the
         # "Resolver" class being redefined.
@@ -367,6 +378,7 @@ class RequirementCommand(IndexGroupCommand):
                 force_reinstall=force_reinstall,
                 upgrade_strategy=upgrade_strategy,
                 py_version_info=py_version_info,
+                prefetch_workers=prefetch_workers,
             )
         import pip._internal.resolution.legacy.resolver
 
@@ -173,6 +173,8 @@ class CacheCommand(Command):
         if args[0] == "*":
             # Only fetch http files if no specific pattern given
             files += self._find_http_files(options)
+            files += self._find_link_files(options)
+            files += self._find_list_latest_files(options)
         else:
             # Add the pattern to the log message
             no_matching_msg += ' for pattern "{}"'.format(args[0])
@@ -198,6 +200,14 @@ class CacheCommand(Command):
         http_dir = self._cache_dir(options, "http")
         return filesystem.find_files(http_dir, "*")
 
+    def _find_link_files(self, options: Values) -> List[str]:
+        links_dir = self._cache_dir(options, "links")
+        return filesystem.find_files(links_dir, "*")
+
+    def _find_list_latest_files(self, options: Values) -> List[str]:
+        list_latest_dir = self._cache_dir(options, "list-latest")
+        return filesystem.find_files(list_latest_dir, "*")
+
     def _find_wheels(self, options: Values, pattern: str) -> List[str]:
         wheel_dir = self._cache_dir(options, "wheels")
 
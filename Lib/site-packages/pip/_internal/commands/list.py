@@ -1,21 +1,38 @@
+import hashlib
 import json
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from optparse import Values
-from typing import TYPE_CHECKING, Generator, List, Optional, Sequence, Tuple, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from pip._vendor.packaging.utils import canonicalize_name
+from pip._vendor.packaging.version import parse as parse_version
 
 from pip._internal.cli import cmdoptions
 from pip._internal.cli.req_command import IndexGroupCommand
 from pip._internal.cli.status_codes import SUCCESS
 from pip._internal.exceptions import CommandError
 from pip._internal.index.collector import LinkCollector
-from pip._internal.index.package_finder import PackageFinder
+from pip._internal.index.package_finder import INDEX_LOOKUP_WORKERS, PackageFinder
 from pip._internal.metadata import BaseDistribution, get_environment
 from pip._internal.models.selection_prefs import SelectionPreferences
 from pip._internal.network.session import PipSession
 from pip._internal.utils.compat import stdlib_pkgs
-from pip._internal.utils.misc import tabulate, write_output
+from pip._internal.utils.filesystem import adjacent_tmp_file, check_path_owner, replace
+from pip._internal.utils.misc import ensure_dir, tabulate, write_output
 
 if TYPE_CHECKING:
     from pip._internal.metadata.base import DistributionVersion
@@ -35,6 +52,93 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# How long the latest version found for a project is reused, in seconds.
+LATEST_VERSION_CACHE_TTL = 60 * 60
+
+# The latest version and file type found for a project, or (None, None) if
+# the index has no candidate for it.
+_LatestInfo = Tuple[Optional[str], Optional[str]]
+
+
+class LatestVersionCache:
+    """Latest versions found on the index, by project.
+
+    The entries are kept in a JSON file in the cache directory, one file per
+    environment and index configuration, and are used again for
+    LATEST_VERSION_CACHE_TTL seconds. Without a cache directory the entries
+    only live as long as the object.
+    """
+
+    def __init__(self, cache_dir: str, key: str) -> None:
+        self.key = key
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._changed = False
+        self._path = None
+
+        if cache_dir:
+            name = hashlib.sha224(key.encode()).hexdigest()
+            self._path = os.path.join(cache_dir, "list-latest", name)
+            try:
+                with open(self._path, encoding="utf-8") as cache_file:
+                    state = json.load(cache_file)
+                if state["key"] == key:
+                    self._projects = state["projects"]
+            except (OSError, ValueError, KeyError, TypeError):
+                # Explicitly suppressing exceptions, since we don't want to
+                # error out if the cache file is invalid.
+                pass
+
+    def get(self, project_name: str, current_time: float) -> Optional[_LatestInfo]:
+        """The cached latest version of a project, if it has not expired."""
+        entry = self._projects.get(project_name)
+        if entry is None:
+            return None
+        try:
+            age = current_time - entry["last_check"]
+            if not 0 <= age <= LATEST_VERSION_CACHE_TTL:
+                return None
+            return entry["version"], entry["filetype"]
+        except (KeyError, TypeError):
+            return None
+
+    def set(
+        self, project_name: str, latest: _LatestInfo, current_time: float
+    ) -> None:
+        version, filetype = latest
+        self._projects[project_name] = {
+            "last_check": current_time,
+            "version": version,
+            "filetype": filetype,
+        }
+        self._changed = True
+
+    def save(self, current_time: float) -> None:
+        # If we do not have a path to cache in, don't bother saving.
+        if not self._path or not self._changed:
+            return
+
+        # Check to make sure that we own the directory
+        if not check_path_owner(os.path.dirname(self._path)):
+            return
+        ensure_dir(os.path.dirname(self._path))
+
+        # Expired entries are dropped, so the file does not grow forever.
+        projects = {
+            name: entry
+            for name, entry in self._projects.items()
+            if self.get(name, current_time) is not None
+        }
+        state = {"key": self.key, "projects": projects}
+        text = json.dumps(state, sort_keys=True, separators=(",", ":"))
+
+        try:
+            with adjacent_tmp_file(self._path) as f:
+                f.write(text.encode())
+            replace(f.name, self._path)
+        except OSError:
+            # Best effort.
+            pass
+
 
 class ListCommand(IndexGroupCommand):
     """
@@ -232,11 +336,22 @@ class ListCommand(IndexGroupCommand):
     ) -> Generator["_DistWithLatestInfo", None, None]:
         with self._build_session(options) as session:
             finder = self._build_package_finder(options, session)
+            cache = LatestVersionCache(
+                options.cache_dir,
+                key=json.dumps(
+                    {
+                        "prefix": sys.prefix,
+                        "index_urls": finder.index_urls,
+                        "find_links": finder.find_links,
+                        "pre": bool(options.pre),
+                    },
+                    sort_keys=True,
+                ),
+            )
+            current_time = time.time()
 
-            def latest_info(
-                dist: "_DistWithLatestInfo",
-            ) -> Optional["_DistWithLatestInfo"]:
-                all_candidates = finder.find_all_candidates(dist.canonical_name)
+            def find_latest(project_name: str) -> _LatestInfo:
+                all_candidates = finder.find_all_candidates(project_name)
                 if not options.pre:
                     # Remove prereleases
                     all_candidates = [
@@ -246,24 +361,43 @@ class ListCommand(IndexGroupCommand):
                     ]
 
                 evaluator = finder.make_candidate_evaluator(
-                    project_name=dist.canonical_name,
+                    project_name=project_name,
                 )
                 best_candidate = evaluator.sort_best_candidate(all_candidates)
                 if best_candidate is None:
-                    return None
+                    return None, None
 
-                remote_version = best_candidate.version
                 if best_candidate.link.is_wheel:
                     typ = "wheel"
                 else:
                     typ = "sdist"
-                dist.latest_version = remote_version
-                dist.latest_filetype = typ
-                return dist
-
-            for dist in map(latest_info, packages):
-                if dist is not None:
-                    yield dist
+                return str(best_candidate.version), typ
+
+            project_names = [
+                name
+                for name in dict.fromkeys(dist.canonical_name for dist in packages)
+                if cache.get(name, current_time) is None
+            ]
+            workers = min(INDEX_LOOKUP_WORKERS, len(project_names))
+
+            # The lookups run on a thread pool sharing the session; map()
+            # returns the results in the order of project_names.
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    found = list(executor.map(find_latest, project_names))
+            else:
+                found = list(map(find_latest, project_names))
+            for project_name, latest in zip(project_names, found):
+                cache.set(project_name, latest, current_time)
+            cache.save(current_time)
+
+        for dist in packages:
+            version, typ = cache.get(dist.canonical_name, current_time) or (None, None)
+            if version is None or typ is None:
+                continue
+            dist.latest_version = parse_version(version)
+            dist.latest_filetype = typ
+            yield dist
 
     def output_package_listing(
         self, packages: "_ProcessedDists", options: Values
@@ -2,6 +2,7 @@
 The main purpose of this module is to expose LinkCollector.collect_sources().
 """
 
+import codecs
 import collections
 import email.message
 import functools
@@ -18,6 +19,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     MutableMapping,
     NamedTuple,
@@ -29,7 +31,8 @@ from typing import (
 
 from pip._vendor import requests
 from pip._vendor.requests import Response
-from pip._vendor.requests.exceptions import RetryError, SSLError
+from pip._vendor.requests.exceptions import RequestException, RetryError, SSLError
+from pip._vendor.requests.models import CONTENT_CHUNK_SIZE
 
 from pip._internal.exceptions import NetworkConnectionError
 from pip._internal.models.link import Link
@@ -40,6 +43,7 @@ from pip._internal.utils.filetypes import is_archive_file
 from pip._internal.utils.misc import redact_auth_from_url
 from pip._internal.vcs import vcs
 
+from .link_cache import LinkCache
 from .sources import CandidatesFromPage, LinkSource, build_source
 
 if TYPE_CHECKING:
@@ -126,6 +130,9 @@ def _get_simple_response(url: str, session: PipSession) -> Response:
     2. Actually perform the request. Raise HTTP exceptions on network failures.
     3. Check the Content-Type header to make sure we got a Simple API response,
        and raise `_NotAPIContent` otherwise.
+
+    The body is not read yet: the response is streamed, so its links can be
+    parsed as the content arrives.
     """
     if is_archive_file(Link(url).filename):
         _ensure_api_response(url, session=session)
@@ -157,16 +164,21 @@ def _get_simple_response(url: str, session: PipSession) -> Response:
             # For more information, please see pypa/pip#5670.
             "Cache-Control": "max-age=0",
         },
+        stream=True,
     )
-    raise_for_status(resp)
-
-    # The check for archives above only works if the url ends with
-    # something that looks like an archive. However that is not a
-    # requirement of an url. Unless we issue a HEAD request on every
-    # url we cannot know ahead of time for sure if something is a
-    # Simple API response or not. However we can check after we've
-    # downloaded it.
-    _ensure_api_header(resp)
+    try:
+        raise_for_status(resp)
+
+        # The check for archives above only works if the url ends with
+        # something that looks like an archive. However that is not a
+        # requirement of an url. Unless we issue a HEAD request on every
+        # url we cannot know ahead of time for sure if something is a
+        # Simple API response or not. However we can check after we've
+        # received its headers.
+        _ensure_api_header(resp)
+    except Exception:
+        resp.close()
+        raise
 
     logger.debug(
         "Fetched page %s as %s",
@@ -225,7 +237,28 @@ def with_cached_index_content(fn: ParseLinks) -> ParseLinks:
     return wrapper_wrapper
 
 
+def with_persisted_links(fn: ParseLinks) -> ParseLinks:
+    """
+    Given a function that parses an Iterable[Link] from an IndexContent, store the
+    function's result in the page's LinkCache, and reuse it for as long as the
+    server sends the page with the same validator (ETag or Last-Modified).
+    """
+
+    @functools.wraps(fn)
+    def wrapper(page: "IndexContent") -> Iterable[Link]:
+        if page.link_cache is None or page.validator is None:
+            return fn(page)
+        links = page.link_cache.get(page.url, page.validator)
+        if links is None:
+            links = list(fn(page))
+            page.link_cache.set(page.url, page.validator, links)
+        return links
+
+    return wrapper
+
+
 @with_cached_index_content
+@with_persisted_links
 def parse_links(page: "IndexContent") -> Iterable[Link]:
     """
     Parse a Simple API's Index Content, and yield its anchor elements as Link objects.
@@ -233,6 +266,8 @@ def parse_links(page: "IndexContent") -> Iterable[Link]:
 
     content_type_l = page.content_type.lower()
     if content_type_l.startswith("application/vnd.pypi.simple.v1+json"):
+        # The json module cannot decode a document incrementally, so JSON
+        # pages are read whole.
         data = json.loads(page.content)
         for file in data.get("files", []):
             link = Link.from_json(file, page.url)
@@ -241,17 +276,28 @@ def parse_links(page: "IndexContent") -> Iterable[Link]:
             yield link
         return
 
+    # HTML pages are decoded and parsed chunk by chunk as they are read, and
+    # the links of each chunk are yielded before the next one is read.
     parser = HTMLLinkParser(page.url)
-    encoding = page.encoding or "utf-8"
-    parser.feed(page.content.decode(encoding))
-
+    decoder = codecs.getincrementaldecoder(page.encoding or "utf-8")()
     url = page.url
-    base_url = parser.base_url or url
-    for anchor in parser.anchors:
-        link = Link.from_element(anchor, page_url=url, base_url=base_url)
-        if link is None:
-            continue
-        yield link
+    chunks = page.iter_content()
+    while True:
+        chunk = next(chunks, None)
+        if chunk is None:
+            parser.feed(decoder.decode(b"", final=True))
+        else:
+            parser.feed(decoder.decode(chunk))
+
+        base_url = parser.base_url or url
+        for anchor in parser.pop_anchors():
+            link = Link.from_element(anchor, page_url=url, base_url=base_url)
+            if link is None:
+                continue
+            yield link
+
+        if chunk is None:
+            break
 
 
 class IndexContent:
@@ -259,33 +305,80 @@ class IndexContent:
 
     def __init__(
         self,
-        content: bytes,
+        content: Optional[bytes],
         content_type: str,
         encoding: Optional[str],
         url: str,
         cache_link_parsing: bool = True,
+        validator: Optional[str] = None,
+        link_cache: Optional[LinkCache] = None,
+        response: Optional[Response] = None,
     ) -> None:
         """
+        :param content: the body of the page, or None to read it from
+                        ``response`` when it is needed.
         :param encoding: the encoding to decode the given content.
         :param url: the URL from which the HTML was downloaded.
         :param cache_link_parsing: whether links parsed from this page's url
                                    should be cached. PyPI index urls should
                                    have this set to False, for example.
+        :param validator: the ETag or Last-Modified header of the response,
+                          which changes whenever the content does.
+        :param link_cache: where the links parsed from this page are kept
+                           between runs, keyed by url and validator.
+        :param response: a streamed response whose body has not been read.
         """
-        self.content = content
+        assert content is not None or response is not None
+        self._content = content
+        self._response = response
         self.content_type = content_type
         self.encoding = encoding
         self.url = url
         self.cache_link_parsing = cache_link_parsing
+        self.validator = validator
+        self.link_cache = link_cache
 
     def __str__(self) -> str:
         return redact_auth_from_url(self.url)
 
+    @property
+    def content(self) -> bytes:
+        """The whole body of the page, reading the rest of the response first."""
+        if self._content is None:
+            self._content = b"".join(self.iter_content())
+        return self._content
+
+    def iter_content(self) -> Iterator[bytes]:
+        """The body of the page in chunks, read from the response as needed.
+
+        A streamed response can only be read once; after that, use ``content``.
+        """
+        if self._content is not None:
+            yield self._content
+            return
+        assert self._response is not None
+        response, self._response = self._response, None
+        try:
+            yield from response.iter_content(CONTENT_CHUNK_SIZE)
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        """Release the connection of a response that was not read."""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
 
 class HTMLLinkParser(HTMLParser):
     """
     HTMLParser that keeps the first base HREF and a list of all anchor
     elements' attributes.
+
+    The page can be fed in parts, taking the anchors found so far with
+    pop_anchors() after each part. A base HREF then only applies to the
+    anchors that come after it, which it always does in a valid page, since
+    ``<base>`` belongs in the head.
     """
 
     def __init__(self, url: str) -> None:
@@ -303,6 +396,11 @@ class HTMLLinkParser(HTMLParser):
         elif tag == "a":
             self.anchors.append(dict(attrs))
 
+    def pop_anchors(self) -> List[Dict[str, Optional[str]]]:
+        """Return the anchors found since the last call, and forget them."""
+        anchors, self.anchors = self.anchors, []
+        return anchors
+
     def get_href(self, attrs: List[Tuple[str, Optional[str]]]) -> Optional[str]:
         for name, value in attrs:
             if name == "href":
@@ -320,20 +418,46 @@ def _handle_get_simple_fail(
     meth("Could not fetch URL %s: %s - skipping", link, reason)
 
 
+def parse_fetched_links(link: Link, page: "IndexContent") -> List[Link]:
+    """Parse the links of the index page fetched for ``link``.
+
+    The page body is streamed, so the connection can still fail while the
+    links are parsed. That is reported like a failed fetch, and no links are
+    returned. The page's connection is released either way.
+    """
+    try:
+        return list(parse_links(page))
+    except RequestException as exc:
+        _handle_get_simple_fail(link, exc)
+        return []
+    finally:
+        # The links may have come from a cache without the page being read,
+        # so release its connection.
+        page.close()
+
+
 def _make_index_content(
-    response: Response, cache_link_parsing: bool = True
+    response: Response,
+    cache_link_parsing: bool = True,
+    link_cache: Optional[LinkCache] = None,
 ) -> IndexContent:
     encoding = _get_encoding_from_headers(response.headers)
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
     return IndexContent(
-        response.content,
+        None,
         response.headers["Content-Type"],
         encoding=encoding,
         url=response.url,
         cache_link_parsing=cache_link_parsing,
+        validator=validator,
+        link_cache=link_cache,
+        response=response,
     )
 
 
-def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexContent"]:
+def _get_index_content(
+    link: Link, *, session: PipSession, link_cache: Optional[LinkCache] = None
+) -> Optional["IndexContent"]:
     url = link.url.split("#", 1)[0]
 
     # Check for VCS schemes that do not support lookup as web pages.
@@ -390,7 +514,9 @@ def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexCon
     except requests.Timeout:
         _handle_get_simple_fail(link, "timed out")
     else:
-        return _make_index_content(resp, cache_link_parsing=link.cache_link_parsing)
+        return _make_index_content(
+            resp, cache_link_parsing=link.cache_link_parsing, link_cache=link_cache
+        )
     return None
 
 
@@ -412,9 +538,11 @@ class LinkCollector:
         self,
         session: PipSession,
         search_scope: SearchScope,
+        link_cache: Optional[LinkCache] = None,
     ) -> None:
         self.search_scope = search_scope
         self.session = session
+        self.link_cache = link_cache
 
     @classmethod
     def create(
@@ -444,9 +572,17 @@ class LinkCollector:
             index_urls=index_urls,
             no_index=options.no_index,
         )
+        if options.cache_dir:
+            link_cache: Optional[LinkCache] = LinkCache(
+                os.path.join(options.cache_dir, "links")
+            )
+        else:
+            link_cache = None
+
         link_collector = LinkCollector(
             session=session,
             search_scope=search_scope,
+            link_cache=link_cache,
         )
         return link_collector
 
@@ -458,7 +594,9 @@ class LinkCollector:
         """
         Fetch an HTML page containing package links.
         """
-        return _get_index_content(location, session=self.session)
+        return _get_index_content(
+            location, session=self.session, link_cache=self.link_cache
+        )
 
     def collect_sources(
         self,
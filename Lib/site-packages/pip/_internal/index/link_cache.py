@@ -0,0 +1,229 @@
+"""
+Persistent cache of the links parsed from index pages.
+
+The HTTP cache already avoids downloading an index page again when it has not
+changed, but the page still has to be parsed in every pip invocation. This
+cache keeps the parsed links of a page on disk, keyed by the page's URL and
+validator (its ETag, or its Last-Modified date), so an unchanged page is not
+parsed again.
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import urllib.parse
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pip._internal.models.link import Link, MetadataFile
+from pip._internal.utils.filesystem import adjacent_tmp_file, check_path_owner, replace
+from pip._internal.utils.misc import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"PLNK"
+_VERSION = 1
+
+# Header: magic, format version, number of strings in the string table.
+_HEADER = struct.Struct("<4sHI")
+# String table entry: length of the UTF-8 encoded string that follows.
+_STRING = struct.Struct("<I")
+# Link: url, requires_python and yanked_reason (as string table indexes),
+# metadata file kind, number of hashes and number of metadata file hashes.
+# Each link is followed by (name, value) string table index pairs, the
+# link's hashes first.
+_LINK = struct.Struct("<IIIBHH")
+_PAIR = struct.Struct("<II")
+_COUNT = struct.Struct("<I")
+
+# String table index standing for None.
+_NONE = 0xFFFFFFFF
+
+# Metadata file kinds: no metadata file, a metadata file without hashes, and a
+# metadata file with hashes.
+_NO_METADATA = 0
+_METADATA = 1
+_METADATA_WITH_HASHES = 2
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._indexes: Dict[str, int] = {}
+
+    def add(self, string: Optional[str]) -> int:
+        if string is None:
+            return _NONE
+        index = self._indexes.get(string)
+        if index is None:
+            index = self._indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+
+def serialize_links(url: str, validator: str, links: Sequence[Link]) -> bytes:
+    """Encode the links of a page into the cache file format.
+
+    Every string (URLs, hash names and values, Requires-Python specifiers) is
+    stored once in a string table and referred to by index, so the values
+    repeated by most links of a page cost 4 bytes each.
+    """
+    table = _StringTable()
+    table.add(url)
+    table.add(validator)
+
+    records = []
+    for link in links:
+        # Link has no public accessor for all of its hashes.
+        hashes = link._hashes
+        metadata = link.metadata_file_data
+        if metadata is None:
+            kind, metadata_hashes = _NO_METADATA, {}
+        elif metadata.hashes is None:
+            kind, metadata_hashes = _METADATA, {}
+        else:
+            kind, metadata_hashes = _METADATA_WITH_HASHES, metadata.hashes
+        records.append(
+            _LINK.pack(
+                table.add(link.url),
+                table.add(link.requires_python),
+                table.add(link.yanked_reason),
+                kind,
+                len(hashes),
+                len(metadata_hashes),
+            )
+        )
+        for pairs in (hashes, metadata_hashes):
+            for name, value in pairs.items():
+                records.append(_PAIR.pack(table.add(name), table.add(value)))
+
+    chunks = [_HEADER.pack(_MAGIC, _VERSION, len(table.strings))]
+    for string in table.strings:
+        data = string.encode("utf-8")
+        chunks.append(_STRING.pack(len(data)))
+        chunks.append(data)
+    chunks.append(_COUNT.pack(len(links)))
+    chunks.extend(records)
+    return b"".join(chunks)
+
+
+def deserialize_links(data: bytes) -> Tuple[str, str, List[Link]]:
+    """Decode a cache file into the page URL, the validator and the links.
+
+    Raises ValueError if the data is not a valid cache file.
+    """
+    try:
+        magic, version, string_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a link cache file")
+        offset = _HEADER.size
+
+        strings: List[str] = []
+        for _ in range(string_count):
+            (length,) = _STRING.unpack_from(data, offset)
+            offset += _STRING.size
+            strings.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+
+        def string(index: int) -> Optional[str]:
+            return None if index == _NONE else strings[index]
+
+        def pairs(count: int) -> Dict[str, str]:
+            nonlocal offset
+            result = {}
+            for _ in range(count):
+                name, value = _PAIR.unpack_from(data, offset)
+                offset += _PAIR.size
+                result[strings[name]] = strings[value]
+            return result
+
+        url, validator = strings[0], strings[1]
+
+        (link_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        links = []
+        for _ in range(link_count):
+            link_url, requires_python, yanked_reason, kind, hash_count, meta_count = (
+                _LINK.unpack_from(data, offset)
+            )
+            offset += _LINK.size
+            hashes = pairs(hash_count)
+            metadata_hashes = pairs(meta_count)
+            if kind == _NO_METADATA:
+                metadata_file_data = None
+            elif kind == _METADATA:
+                metadata_file_data = MetadataFile(None)
+            else:
+                metadata_file_data = MetadataFile(metadata_hashes)
+            links.append(
+                Link(
+                    strings[link_url],
+                    comes_from=url,
+                    requires_python=string(requires_python),
+                    yanked_reason=string(yanked_reason),
+                    metadata_file_data=metadata_file_data,
+                    hashes=hashes,
+                )
+            )
+    except (struct.error, IndexError, UnicodeDecodeError, TypeError) as exc:
+        raise ValueError(f"invalid link cache file: {exc}")
+    if offset != len(data):
+        raise ValueError("invalid link cache file: trailing data")
+    return url, validator, links
+
+
+class LinkCache:
+    """The parsed links of index pages, one file per page URL.
+
+    A file is only used while the server reports the same validator for the
+    page. Pages whose URL holds credentials are not stored, since the links
+    would carry them onto the disk as well.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _path(self, url: str) -> str:
+        name = hashlib.sha224(url.encode()).hexdigest()
+        # Store in a nested directory structure, like the HTTP cache, to
+        # avoid having a lot of files in one directory.
+        return os.path.join(self.directory, name[:2], name[2:4], name[4:])
+
+    @staticmethod
+    def is_cacheable(url: str) -> bool:
+        return "@" not in urllib.parse.urlsplit(url).netloc
+
+    def get(self, url: str, validator: str) -> Optional[List[Link]]:
+        if not self.is_cacheable(url):
+            return None
+        try:
+            with open(self._path(url), "rb") as cache_file:
+                cached_url, cached_validator, links = deserialize_links(
+                    cache_file.read()
+                )
+        except (OSError, ValueError) as exc:
+            # A missing or broken cache file just means the page is parsed.
+            if not isinstance(exc, FileNotFoundError):
+                logger.debug("Ignoring link cache of %s: %s", url, exc)
+            return None
+        if cached_url != url or cached_validator != validator:
+            return None
+        return links
+
+    def set(self, url: str, validator: str, links: Sequence[Link]) -> None:
+        if not self.is_cacheable(url):
+            return
+        path = self._path(url)
+
+        # Check to make sure that we own the directory
+        if not check_path_owner(self.directory):
+            return
+
+        try:
+            ensure_dir(os.path.dirname(path))
+            with adjacent_tmp_file(path) as f:
+                f.write(serialize_links(url, validator, links))
+            replace(f.name, path)
+        except OSError as exc:
+            # Best effort.
+            logger.debug("Could not write link cache of %s: %s", url, exc)
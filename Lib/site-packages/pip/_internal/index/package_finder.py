@@ -5,13 +5,25 @@ import functools
 import itertools
 import logging
 import re
-from typing import TYPE_CHECKING, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pip._vendor.packaging import specifiers
 from pip._vendor.packaging.tags import Tag
 from pip._vendor.packaging.utils import canonicalize_name
 from pip._vendor.packaging.version import _BaseVersion
 from pip._vendor.packaging.version import parse as parse_version
+from pip._vendor.requests.exceptions import RequestException
 
 from pip._internal.exceptions import (
     BestVersionAlreadyInstalled,
@@ -19,7 +31,11 @@ from pip._internal.exceptions import (
     InvalidWheelFilename,
     UnsupportedWheel,
 )
-from pip._internal.index.collector import LinkCollector, parse_links
+from pip._internal.index.collector import (
+    IndexContent,
+    LinkCollector,
+    parse_fetched_links,
+)
 from pip._internal.models.candidate import InstallationCandidate
 from pip._internal.models.format_control import FormatControl
 from pip._internal.models.link import Link
@@ -27,6 +43,7 @@ from pip._internal.models.search_scope import SearchScope
 from pip._internal.models.selection_prefs import SelectionPreferences
 from pip._internal.models.target_python import TargetPython
 from pip._internal.models.wheel import Wheel
+from pip._internal.network.auth import MultiDomainBasicAuth
 from pip._internal.req import InstallRequirement
 from pip._internal.utils._log import getLogger
 from pip._internal.utils.filetypes import WHEEL_EXTENSION
@@ -44,6 +61,9 @@ __all__ = ["FormatControl", "BestCandidateResult", "PackageFinder"]
 
 logger = getLogger(__name__)
 
+# Index pages fetched at the same time by the concurrent project lookups.
+INDEX_LOOKUP_WORKERS = 5
+
 BuildTag = Union[Tuple[()], Tuple[int, str]]
 CandidateSortingKey = Tuple[int, int, int, _BaseVersion, Optional[int], BuildTag]
 
@@ -629,6 +649,10 @@ class PackageFinder:
         # These are boring links that have already been logged somehow.
         self._logged_links: Set[Tuple[Link, LinkType, str]] = set()
 
+        # Index pages fetched by prefetch_project_pages(), by URL, until
+        # process_project_url() picks them up.
+        self._prefetched_pages: Dict[str, IndexContent] = {}
+
     # Don't include an allow_yanked default value to make sure each call
     # site considers whether yanked releases are allowed. This also causes
     # that decision to be made explicit in the calling code, which helps
@@ -788,11 +812,13 @@ class PackageFinder:
             "Fetching project page and analyzing links: %s",
             project_url,
         )
-        index_response = self._link_collector.fetch_response(project_url)
+        index_response = self._prefetched_pages.pop(project_url.url, None)
+        if index_response is None:
+            index_response = self._link_collector.fetch_response(project_url)
         if index_response is None:
             return []
 
-        page_links = list(parse_links(index_response))
+        page_links = parse_fetched_links(project_url, index_response)
 
         with indent_log():
             package_links = self.evaluate_links(
@@ -802,6 +828,66 @@ class PackageFinder:
 
         return package_links
 
+    def prefetch_project_pages(
+        self, project_names: Iterable[str], max_workers: int
+    ) -> None:
+        """Fetch the index pages of several projects concurrently.
+
+        find_all_candidates() fetches the pages of a project one index URL at
+        a time, when the project is first looked up. This fetches the index
+        pages of all the given projects up front, with up to ``max_workers``
+        requests in flight, and keeps them until find_all_candidates()
+        processes them.
+
+        Pages that cannot be fetched are not kept, so they are requested
+        again (and the failure reported, or credentials prompted for) when
+        the project is looked up. Pages from insecure origins are left to
+        find_all_candidates() as well.
+        """
+        session = self._link_collector.session
+        links: Dict[str, Link] = {}
+        for project_name in project_names:
+            for url in self.search_scope.get_index_urls_locations(project_name):
+                link = Link(url, cache_link_parsing=False)
+                if link.url in links or link.url in self._prefetched_pages:
+                    continue
+                if session.is_secure_origin(link):
+                    links[link.url] = link
+        if len(links) <= 1:
+            return
+
+        logger.debug("Prefetching %d index page(s)", len(links))
+
+        # Worker threads must not prompt for credentials on the terminal at
+        # the same time.
+        auth = session.auth
+        prompting = isinstance(auth, MultiDomainBasicAuth) and auth.prompting
+        if prompting:
+            auth.prompting = False
+        try:
+            workers = min(max_workers, len(links))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = executor.map(self._prefetch_page, links.values())
+                for url, response in zip(links, responses):
+                    if response is not None:
+                        self._prefetched_pages[url] = response
+        finally:
+            if prompting:
+                auth.prompting = True
+
+    def _prefetch_page(self, link: Link) -> Optional[IndexContent]:
+        index_response = self._link_collector.fetch_response(link)
+        if index_response is None:
+            return None
+        # Read the page in the worker thread; a streamed page would keep its
+        # connection until process_project_url() parses it.
+        try:
+            _ = index_response.content
+        except RequestException as exc:
+            logger.debug("Could not prefetch %s: %s", link, exc)
+            return None
+        return index_response
+
     @functools.lru_cache(maxsize=None)
     def find_all_candidates(self, project_name: str) -> List[InstallationCandidate]:
         """Find all available InstallationCandidate for project_name
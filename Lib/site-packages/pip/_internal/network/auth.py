@@ -8,6 +8,7 @@ import os
 import shutil
 import subprocess
 import sysconfig
+import threading
 import typing
 import urllib.parse
 from abc import ABC, abstractmethod
@@ -237,6 +238,10 @@ class MultiDomainBasicAuth(AuthBase):
         # request authenticates, the caller should call
         # ``save_credentials`` to save these.
         self._credentials_to_save: Optional[Credentials] = None
+        # Serializes handle_401() for sessions shared between threads, as in
+        # BatchDownloader's concurrent mode, so the user is asked for the
+        # credentials of a host only once and not once per download thread.
+        self._prompt_lock = threading.Lock()
 
     @property
     def keyring_provider(self) -> KeyRingBaseProvider:
@@ -478,10 +483,56 @@ class MultiDomainBasicAuth(AuthBase):
         if resp.status_code != 401:
             return resp
 
+        # Only looking up or prompting for the credentials holds the lock;
+        # the retried requests of several threads are still sent in parallel.
+        with self._prompt_lock:
+            credentials = self._credentials_for_retry(resp)
+        if credentials is None:
+            return resp
+        username, password, save = credentials
+
+        # Consume content and release the original connection to allow our new
+        #   request to reuse the same one.
+        # The result of the assignment isn't used, it's just needed to consume
+        # the content.
+        _ = resp.content
+        resp.raw.release_conn()
+
+        # Add our new username and password to the request
+        req = HTTPBasicAuth(username or "", password or "")(resp.request)
+        req.register_hook("response", self.warn_on_401)
+
+        # On successful request, save the credentials that were used to
+        # keyring. (Note that if the user responded "no" when asked to save
+        # them, nothing will be saved.)
+        if save:
+            req.register_hook("response", self.save_credentials)
+
+        # Send our new request
+        new_resp = resp.connection.send(req, **kwargs)
+        new_resp.history.append(resp)
+
+        return new_resp
+
+    def _credentials_for_retry(
+        self, resp: Response
+    ) -> Optional[Tuple[Optional[str], Optional[str], bool]]:
+        """Get the credentials to retry a request that got a 401 with.
+
+        Returns the username, the password and whether they are to be saved to
+        keyring, or None if the request cannot be retried. Called under
+        _prompt_lock.
+        """
+        parsed = urllib.parse.urlparse(resp.url)
         username, password = None, None
 
+        # Another thread may have got credentials for this host while the
+        # request was sent without any.
+        if "Authorization" not in resp.request.headers:
+            username, password = self.passwords.get(parsed.netloc, (None, None))
+
         # Query the keyring for credentials:
-        if self.use_keyring:
+        if self.use_keyring and not username and not password:
             username, password = self._get_new_credentials(
                 resp.url,
                 allow_netrc=False,
@@ -490,9 +541,7 @@ class MultiDomainBasicAuth(AuthBase):
 
         # We are not able to prompt the user so simply return the response
         if not self.prompting and not username and not password:
-            return resp
-
-        parsed = urllib.parse.urlparse(resp.url)
+            return None
 
         # Prompt the user for a new username and password
         save = False
@@ -512,28 +561,7 @@ class MultiDomainBasicAuth(AuthBase):
                     password=password,
                 )
 
-        # Consume content and release the original connection to allow our new
-        #   request to reuse the same one.
-        # The result of the assignment isn't used, it's just needed to consume
-        # the content.
-        _ = resp.content
-        resp.raw.release_conn()
-
-        # Add our new username and password to the request
-        req = HTTPBasicAuth(username or "", password or "")(resp.request)
-        req.register_hook("response", self.warn_on_401)
-
-        # On successful request, save the credentials that were used to
-        # keyring. (Note that if the user responded "no" above, this member
-        # is not set and nothing will be saved.)
-        if self._credentials_to_save:
-            req.register_hook("response", self.save_credentials)
-
-        # Send our new request
-        new_resp = resp.connection.send(req, **kwargs)
-        new_resp.history.append(resp)
-
-        return new_resp
+        return username, password, self._credentials_to_save is not None
 
     def warn_on_401(self, resp: Response, **kwargs: Any) -> None:
         """Response callback to warn about incorrect credentials."""
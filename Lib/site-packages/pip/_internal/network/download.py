@@ -1,10 +1,12 @@
 """Download files with progress indicators.
 """
 import email.message
+import hashlib
 import logging
 import mimetypes
 import os
-from typing import Iterable, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from pip._vendor.requests.models import CONTENT_CHUNK_SIZE, Response
 
@@ -150,37 +152,137 @@ class Downloader:
         return filepath, content_type
 
 
+# The hash computed while a file is written, so it does not have to be read back
+# to check it against the requirement's hashes.
+STREAMED_HASH_NAME = "sha256"
+
+# Threads used by BatchDownloader when parallel downloads are enabled. Keep
+# this below the connection pool size of the session's HTTP adapters (10).
+PARALLEL_DOWNLOAD_WORKERS = 5
+
+
+def _log_http_error(error: NetworkConnectionError, link: Link) -> None:
+    assert error.response is not None
+    logger.critical(
+        "HTTP error %s while getting %s",
+        error.response.status_code,
+        link,
+    )
+
+
+def _download_to_file(
+    session: PipSession,
+    link: Link,
+    location: str,
+    progress_bar: str,
+    log_errors: bool = True,
+) -> Tuple[str, str, str]:
+    """Download link into location, hashing the chunks as they are written.
+
+    Returns the file path, the content type and the hex digest of the file.
+    """
+    try:
+        resp = _http_get_download(session, link)
+    except NetworkConnectionError as e:
+        if log_errors:
+            _log_http_error(e, link)
+        raise
+
+    filename = _get_http_response_filename(resp, link)
+    filepath = os.path.join(location, filename)
+
+    digest = hashlib.new(STREAMED_HASH_NAME)
+    chunks = _prepare_download(resp, link, progress_bar)
+    with open(filepath, "wb") as content_file:
+        for chunk in chunks:
+            digest.update(chunk)
+            content_file.write(chunk)
+    content_type = resp.headers.get("Content-Type", "")
+    return filepath, content_type, digest.hexdigest()
+
+
 class BatchDownloader:
+    """Download several files, optionally on a bounded pool of threads.
+
+    With ``max_workers`` greater than one the files are fetched concurrently
+    over the shared session's connection pool. Results are still yielded in
+    the order of the given links, and if several downloads fail, the error of
+    the first failing link in that order is the one raised, so the outcome
+    does not depend on which request happens to finish first. Workers that
+    get a 401 for the same host wait for one credentials prompt (see
+    MultiDomainBasicAuth.handle_401) instead of prompting concurrently.
+    """
+
     def __init__(
         self,
         session: PipSession,
         progress_bar: str,
+        max_workers: int = 1,
     ) -> None:
         self._session = session
         self._progress_bar = progress_bar
+        self._max_workers = max_workers
+        # Maps each downloaded file path to its STREAMED_HASH_NAME hex digest.
+        self.digests: Dict[str, str] = {}
 
     def __call__(
         self, links: Iterable[Link], location: str
     ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
         """Download the files given by links into location."""
-        for link in links:
-            try:
-                resp = _http_get_download(self._session, link)
-            except NetworkConnectionError as e:
-                assert e.response is not None
-                logger.critical(
-                    "HTTP error %s while getting %s",
-                    e.response.status_code,
-                    link,
+        links = list(links)
+        if self._max_workers <= 1 or len(links) <= 1:
+            for link in links:
+                filepath, content_type, digest = _download_to_file(
+                    self._session, link, location, self._progress_bar
                 )
-                raise
+                self.digests[filepath] = digest
+                yield link, (filepath, content_type)
+            return
 
-            filename = _get_http_response_filename(resp, link)
-            filepath = os.path.join(location, filename)
+        yield from self._download_concurrently(links, location)
 
-            chunks = _prepare_download(resp, link, self._progress_bar)
-            with open(filepath, "wb") as content_file:
-                for chunk in chunks:
-                    content_file.write(chunk)
-            content_type = resp.headers.get("Content-Type", "")
-            yield link, (filepath, content_type)
+    def _download_concurrently(
+        self, links: List[Link], location: str
+    ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
+        workers = min(self._max_workers, len(links))
+        logger.info("Downloading %d files using %d threads", len(links), workers)
+
+        # Per-file progress bars cannot share the terminal, so the workers only
+        # log each download and the progress is reported per completed file.
+        total_size = 0
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures: List["Future[Tuple[str, str, str]]"] = []
+        try:
+            for link in links:
+                futures.append(
+                    executor.submit(
+                        _download_to_file,
+                        self._session,
+                        link,
+                        location,
+                        "off",
+                        log_errors=False,
+                    )
+                )
+            for done, (link, future) in enumerate(zip(links, futures), start=1):
+                # Errors are logged and raised here, for the first failing link
+                # in input order; the finally clause cancels the downloads that
+                # have not started yet.
+                try:
+                    filepath, content_type, digest = future.result()
+                except NetworkConnectionError as e:
+                    _log_http_error(e, link)
+                    raise
+                self.digests[filepath] = digest
+                total_size += os.path.getsize(filepath)
+                logger.info(
+                    "Downloaded %d of %d files (%s)",
+                    done,
+                    len(links),
+                    format_size(total_size),
+                )
+                yield link, (filepath, content_type)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
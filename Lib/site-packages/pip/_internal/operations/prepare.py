@@ -29,7 +29,11 @@ from pip._internal.metadata import BaseDistribution, get_metadata_distribution
 from pip._internal.models.direct_url import ArchiveInfo
 from pip._internal.models.link import Link
 from pip._internal.models.wheel import Wheel
-from pip._internal.network.download import BatchDownloader, Downloader
+from pip._internal.network.download import (
+    STREAMED_HASH_NAME,
+    BatchDownloader,
+    Downloader,
+)
 from pip._internal.network.lazy_wheel import (
     HTTPRangeRequestUnsupported,
     dist_from_wheel_url,
@@ -227,6 +231,7 @@ class RequirementPreparer:
         lazy_wheel: bool,
         verbosity: int,
         legacy_resolver: bool,
+        download_workers: int = 1,
     ) -> None:
         super().__init__()
 
@@ -235,7 +240,9 @@ class RequirementPreparer:
         self.build_tracker = build_tracker
         self._session = session
         self._download = Downloader(session, progress_bar)
-        self._batch_download = BatchDownloader(session, progress_bar)
+        self._batch_download = BatchDownloader(
+            session, progress_bar, max_workers=download_workers
+        )
         self.finder = finder
 
         # Where still-packed archives should be written to. If None, they are
@@ -266,6 +273,10 @@ class RequirementPreparer:
         # Memoized downloaded files, as mapping of url: path.
         self._downloaded: Dict[str, str] = {}
 
+        # Hex digests (of STREAMED_HASH_NAME) computed while downloading, as
+        # mapping of url: digest, so the files need not be hashed again.
+        self._downloaded_digests: Dict[str, str] = {}
+
         # Previous "header" printed for a link-based InstallRequirement
         self._previous_requirement_header = ("", "")
 
@@ -493,6 +504,9 @@ class RequirementPreparer:
             # I have fixed the issue *just* for wheels.
             if req.is_wheel:
                 self._downloaded[req.link.url] = filepath
+                digest = self._batch_download.digests.get(filepath)
+                if digest is not None:
+                    self._downloaded_digests[req.link.url] = digest
 
         # This step is necessary to ensure all lazy wheels are processed
         # successfully by the 'download', 'wheel', and 'install' commands.
@@ -621,7 +635,13 @@ class RequirementPreparer:
                 )
         else:
             file_path = self._downloaded[link.url]
-            if hashes:
+            digest = self._downloaded_digests.get(link.url)
+            # A matching streamed digest is enough; otherwise read the file
+            # to check the other hash algorithms (or raise HashMismatch).
+            if hashes and not (
+                digest is not None
+                and hashes.is_hash_allowed(STREAMED_HASH_NAME, digest)
+            ):
                 hashes.check_against_path(file_path)
             local_file = File(file_path, content_type=None)
 
@@ -640,7 +660,10 @@ class RequirementPreparer:
                 and not req.download_info.info.hashes
                 and local_file
             ):
-                hash = hash_file(local_file.path)[0].hexdigest()
+                # The streamed digest, if any, is the sha256 of the same file.
+                hash = self._downloaded_digests.get(link.url)
+                if hash is None:
+                    hash = hash_file(local_file.path)[0].hexdigest()
                 # We populate info.hash for backward compatibility.
                 # This will automatically populate info.hashes.
                 req.download_info.info.hash = f"sha256={hash}"
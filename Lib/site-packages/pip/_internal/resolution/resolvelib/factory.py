@@ -79,6 +79,18 @@ C = TypeVar("C")
 Cache = Dict[Link, C]
 
 
+def _is_pinned(specifier: SpecifierSet) -> bool:
+    for sp in specifier:
+        if sp.operator == "===":
+            return True
+        if sp.operator != "==":
+            continue
+        if sp.version.endswith(".*"):
+            continue
+        return True
+    return False
+
+
 class CollectedRootRequirements(NamedTuple):
     requirements: List[Requirement]
     constraints: Dict[str, Constraint]
@@ -288,18 +300,7 @@ class Factory:
             # solely satisfied by a yanked release.
             all_yanked = all(ican.link.is_yanked for ican in icans)
 
-            def is_pinned(specifier: SpecifierSet) -> bool:
-                for sp in specifier:
-                    if sp.operator == "===":
-                        return True
-                    if sp.operator != "==":
-                        continue
-                    if sp.version.endswith(".*"):
-                        continue
-                    return True
-                return False
-
-            pinned = is_pinned(specifier)
+            pinned = _is_pinned(specifier)
 
             # PackageFinder returns earlier versions first, so we reverse.
             for ican in reversed(icans):
@@ -499,6 +500,37 @@ class Factory:
                 collected.requirements.append(req)
         return collected
 
+    def prefetch_index_pages(
+        self,
+        requirements: Iterable[Requirement],
+        constraints: Mapping[str, Constraint],
+        upgrade: bool,
+        max_workers: int,
+    ) -> None:
+        """Fetch the index pages of root and pinned projects before resolving.
+
+        The pinned projects are those constrained to one version (with ``==``
+        or ``===``) and without a link. Only projects that will be looked up
+        on the index are included: projects satisfied by an installed
+        distribution are skipped, unless they are going to be upgraded or
+        reinstalled.
+        """
+        names: List[NormalizedName] = []
+        for req in requirements:
+            if isinstance(req, SpecifierRequirement):
+                names.append(req.project_name)
+        for name, constraint in constraints.items():
+            if not constraint.links and _is_pinned(constraint.specifier):
+                names.append(canonicalize_name(name))
+
+        project_names = []
+        for name in dict.fromkeys(names):
+            installed = name in self._installed_dists
+            if installed and not (upgrade or self._force_reinstall):
+                continue
+            project_names.append(name)
+        self._finder.prefetch_project_pages(project_names, max_workers)
+
     def make_requirement_from_candidate(
         self, candidate: Candidate
     ) -> ExplicitRequirement:
@@ -48,6 +48,7 @@ class Resolver(BaseResolver):
         force_reinstall: bool,
         upgrade_strategy: str,
         py_version_info: Optional[Tuple[int, ...]] = None,
+        prefetch_workers: int = 1,
     ):
         super().__init__()
         assert upgrade_strategy in self._allowed_strategies
@@ -65,12 +66,24 @@ class Resolver(BaseResolver):
         )
         self.ignore_dependencies = ignore_dependencies
         self.upgrade_strategy = upgrade_strategy
+        self._prefetch_workers = prefetch_workers
         self._result: Optional[Result] = None
 
     def resolve(
         self, root_reqs: List[InstallRequirement], check_supported_wheels: bool
     ) -> RequirementSet:
         collected = self.factory.collect_root_requirements(root_reqs)
+        if self._prefetch_workers > 1:
+            # Root requirements are upgraded when the strategy allows any
+            # upgrade at all, since they are all user requested. Pinned
+            # constraints are fetched along with them, as they are most
+            # likely pins of the root requirements' dependencies.
+            self.factory.prefetch_index_pages(
+                collected.requirements,
+                collected.constraints,
+                upgrade=self.upgrade_strategy != "to-satisfy-only",
+                max_workers=self._prefetch_workers,
+            )
         provider = PipProvider(
             factory=self.factory,
             constraints=collected.constraints,
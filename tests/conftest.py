@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The tests exercise the pip copy vendored in this environment, not the one
+# of the interpreter running pytest.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "Lib", "site-packages")
+)
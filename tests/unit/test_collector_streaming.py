@@ -0,0 +1,68 @@
+import logging
+from typing import Iterator, List
+
+import pytest
+from pip._vendor.requests.exceptions import ChunkedEncodingError
+
+from pip._internal.index.collector import IndexContent, LinkCollector
+from pip._internal.index.package_finder import PackageFinder
+from pip._internal.models.link import Link
+from pip._internal.models.search_scope import SearchScope
+from pip._internal.models.selection_prefs import SelectionPreferences
+from pip._internal.network.session import PipSession
+
+
+class BrokenStreamResponse:
+    """A streamed response that fails after sending part of the page."""
+
+    def __init__(self, chunks: List[bytes]) -> None:
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        yield from self.chunks
+        raise ChunkedEncodingError("Connection broken: IncompleteRead")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_finder(page: IndexContent) -> PackageFinder:
+    link_collector = LinkCollector(
+        session=PipSession(),
+        search_scope=SearchScope.create(find_links=[], index_urls=[], no_index=False),
+    )
+    link_collector.fetch_response = lambda location: page  # type: ignore[assignment]
+    return PackageFinder.create(
+        link_collector=link_collector,
+        selection_prefs=SelectionPreferences(allow_yanked=True),
+    )
+
+
+def test_process_project_url_skips_page_broken_mid_stream(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    url = "https://example.com/simple/pkg/"
+    response = BrokenStreamResponse(
+        [b'<html><body><a href="pkg-1.0.tar.gz">pkg-1.0.tar.gz</a>']
+    )
+    page = IndexContent(
+        None,
+        "text/html",
+        encoding=None,
+        url=url,
+        cache_link_parsing=False,
+        response=response,  # type: ignore[arg-type]
+    )
+    finder = make_finder(page)
+
+    with caplog.at_level(logging.DEBUG):
+        candidates = finder.process_project_url(
+            Link(url, cache_link_parsing=False),
+            link_evaluator=finder.make_link_evaluator("pkg"),
+        )
+
+    assert candidates == []
+    assert response.closed
+    assert f"Could not fetch URL {url}" in caplog.text
+    assert "IncompleteRead" in caplog.text
@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from pip._vendor.requests.models import PreparedRequest
+
+from pip._internal.network.auth import MultiDomainBasicAuth
+
+
+class FakeConnection:
+    """Records the requests resent by handle_401()."""
+
+    def __init__(self) -> None:
+        self.sent: List[PreparedRequest] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> "Unauthorized":
+        with self.lock:
+            self.sent.append(request)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        response = Unauthorized(request.url or "", self)
+        response.status_code = 200
+        response.request = request
+        return response
+
+
+class Unauthorized:
+    """A 401 response to a request sent without credentials."""
+
+    def __init__(self, url: str, connection: FakeConnection) -> None:
+        self.status_code = 401
+        self.url = url
+        self.connection = connection
+        self.content = b""
+        self.history: List["Unauthorized"] = []
+        self.raw = self
+        self.request = PreparedRequest()
+        self.request.prepare(method="GET", url=url)
+
+    def release_conn(self) -> None:
+        pass
+
+
+def test_concurrent_401s_prompt_once_per_host() -> None:
+    # Download threads sharing one session all get a 401 for the same host
+    # before anyone has entered credentials.
+    auth = MultiDomainBasicAuth(keyring_provider="disabled")
+    prompts = []
+
+    def prompt(netloc: str) -> Tuple[Optional[str], Optional[str], bool]:
+        prompts.append(netloc)
+        time.sleep(0.05)
+        return "user", "secret", False
+
+    auth._prompt_for_password = prompt  # type: ignore[method-assign]
+    connection = FakeConnection()
+    start = threading.Barrier(4)
+
+    def download(number: int) -> int:
+        start.wait()
+        url = f"https://files.example.com/pkg-{number}.tar.gz"
+        return auth.handle_401(Unauthorized(url, connection)).status_code
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        statuses = list(executor.map(download, range(4)))
+
+    assert statuses == [200] * 4
+    assert prompts == ["files.example.com"]
+    assert len(connection.sent) == 4
+    assert all("Authorization" in request.headers for request in connection.sent)
+    # The retried requests are not serialized by the prompt lock.
+    assert connection.max_in_flight > 1